@@ -0,0 +1,197 @@
+"""Cactus Kev style hand evaluator compiled with Numba."""
+
+from itertools import combinations, combinations_with_replacement
+from typing import List, Tuple
+from phevaluator import evaluate_cards
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One prime per rank (2..A); the product of a hand's primes identifies its rank multiset
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+NUM_RANKS = len(PRIMES)
+NUM_SUITS = 4
+SUIT_BITS = 0xF000
+
+
+def _card_code(card_id: int) -> int:
+    """
+    Encode a card index (rank_index * 4 + suit_index) as a Cactus Kev u32.
+    
+    Layout: xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp
+    (b = rank bit, cdhs = suit bit, r = rank index, p = rank prime)
+    """
+    rank, suit = divmod(card_id, NUM_SUITS)
+    return (1 << (16 + rank)) | (0x1000 << suit) | (rank << 8) | PRIMES[rank]
+
+
+def _build_tables():
+    """
+    Build the flush, unique-rank and paired-hand lookup tables.
+    
+    Each 5-card rank pattern is ranked once with phevaluator, so these tables
+    produce exactly the ranks evaluate_cards does (1 = royal flush, 7462 = worst).
+    """
+    flush_lookup = [0] * (1 << NUM_RANKS)
+    unique5_lookup = [0] * (1 << NUM_RANKS)
+    for ranks in combinations(range(NUM_RANKS), 5):
+        rank_bits = sum(1 << rank for rank in ranks)
+        flush_lookup[rank_bits] = evaluate_cards(*(rank * NUM_SUITS for rank in ranks))
+        # Cycle the suits so five distinct ranks never share one
+        unique5_lookup[rank_bits] = evaluate_cards(
+            *(rank * NUM_SUITS + i % NUM_SUITS for i, rank in enumerate(ranks))
+        )
+    
+    paired = []
+    for ranks in combinations_with_replacement(range(NUM_RANKS), 5):
+        if len(set(ranks)) == 5 or any(ranks.count(rank) > NUM_SUITS for rank in ranks):
+            continue
+        # The k-th copy of a rank gets suit k, so every card is distinct
+        cards = [rank * NUM_SUITS + ranks[:i].count(rank) for i, rank in enumerate(ranks)]
+        product = 1
+        for rank in ranks:
+            product *= PRIMES[rank]
+        paired.append((product, evaluate_cards(*cards)))
+    paired.sort()
+    
+    return (
+        flush_lookup,
+        unique5_lookup,
+        [product for product, _ in paired],
+        [rank for _, rank in paired],
+    )
+
+
+# Evaluators over card indexes (rank_index * 4 + suit_index), compiled eagerly so
+# no request pays JIT warmup
+try:
+    import numpy as np
+    from numba import njit
+
+    CARD_CODES = np.array([_card_code(card_id) for card_id in range(52)], dtype=np.int64)
+    _flush, _unique5, _products, _product_ranks = _build_tables()
+    FLUSH_LOOKUP = np.array(_flush, dtype=np.int64)
+    UNIQUE5_LOOKUP = np.array(_unique5, dtype=np.int64)
+    PAIRED_PRODUCTS = np.array(_products, dtype=np.int64)
+    PAIRED_RANKS = np.array(_product_ranks, dtype=np.int64)
+
+    @njit("int64(int64, int64, int64, int64, int64)", cache=True)
+    def _eval5_codes(c0, c1, c2, c3, c4):
+        """Rank five Cactus Kev card codes."""
+        rank_bits = (c0 | c1 | c2 | c3 | c4) >> 16
+        if c0 & c1 & c2 & c3 & c4 & SUIT_BITS:
+            return FLUSH_LOOKUP[rank_bits]
+        rank = UNIQUE5_LOOKUP[rank_bits]
+        if rank:
+            return rank
+        product = (c0 & 0xFF) * (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF)
+        return PAIRED_RANKS[np.searchsorted(PAIRED_PRODUCTS, product)]
+
+    @njit("int64(int64[:])", cache=True)
+    def _evaluate_codes(codes):
+        """Rank the best five-card hand among 5-7 Cactus Kev card codes."""
+        num_cards = codes.shape[0]
+        best = 9999
+        for a in range(num_cards - 4):
+            for b in range(a + 1, num_cards - 3):
+                for c in range(b + 1, num_cards - 2):
+                    for d in range(c + 1, num_cards - 1):
+                        for e in range(d + 1, num_cards):
+                            rank = _eval5_codes(codes[a], codes[b], codes[c], codes[d], codes[e])
+                            if rank < best:
+                                best = rank
+        return best
+
+    @njit("int64(int64[:])", cache=True)
+    def evaluate_ids(card_ids):
+        """Rank a 5-7 card hand of card indexes; lower is stronger, like phevaluator."""
+        return _evaluate_codes(CARD_CODES[card_ids])
+
+    @njit("UniTuple(int64, 3)(int64[:], int64[:])", cache=True)
+    def _best_hand_nb(board_ids, remaining_ids):
+        """
+        Best rank any two of remaining_ids make with a 3-5 card board, and a pair
+        making it ((-1, -1) when the board alone does).
+        
+        Five-card hands using neither or one hole card don't depend on the other
+        hole card, so those are ranked once per card instead of once per pair.
+        """
+        board = CARD_CODES[board_ids]
+        remaining = CARD_CODES[remaining_ids]
+        num_board = board.shape[0]
+        num_remaining = remaining.shape[0]
+        best_first = -1
+        best_second = -1
+        if num_board < 3:
+            return 9999, best_first, best_second
+        
+        # Board only
+        best = 9999
+        if num_board == 5:
+            best = _evaluate_codes(board)
+        
+        # Four board cards plus one hole card
+        single = np.full(num_remaining, 9999, dtype=np.int64)
+        for i in range(num_remaining):
+            for a in range(num_board - 3):
+                for b in range(a + 1, num_board - 2):
+                    for c in range(b + 1, num_board - 1):
+                        for d in range(c + 1, num_board):
+                            rank = _eval5_codes(board[a], board[b], board[c], board[d], remaining[i])
+                            if rank < single[i]:
+                                single[i] = rank
+        
+        # Three board cards plus both hole cards
+        for i in range(num_remaining):
+            best_i = min(best, single[i])
+            for j in range(i + 1, num_remaining):
+                pair_best = min(best_i, single[j])
+                for a in range(num_board - 2):
+                    for b in range(a + 1, num_board - 1):
+                        for c in range(b + 1, num_board):
+                            rank = _eval5_codes(board[a], board[b], board[c], remaining[i], remaining[j])
+                            if rank < pair_best:
+                                pair_best = rank
+                if pair_best < best:
+                    best = pair_best
+                    best_first = remaining_ids[i]
+                    best_second = remaining_ids[j]
+            # Nothing beats a royal flush
+            if best == 1:
+                break
+        return best, best_first, best_second
+
+    def best_hand_for_any_hole_cards(board_ids: List[int], remaining_ids: List[int]) -> Tuple[int, Tuple[int, int]]:
+        """
+        Find the best (lowest) rank any two remaining cards make with the board,
+        with a pair of card ids making it ((-1, -1) when the board alone does).
+        """
+        if not 3 <= len(board_ids) <= 5:
+            return 9999, (-1, -1)  # Worst possible hand
+        best, first_id, second_id = _best_hand_nb(
+            np.array(board_ids, dtype=np.int64), np.array(remaining_ids, dtype=np.int64)
+        )
+        return best, (first_id, second_id)
+
+except ImportError:
+    logger.warning("Numba not available, using phevaluator for the nuts search")
+    
+    def best_hand_for_any_hole_cards(board_ids: List[int], remaining_ids: List[int]) -> Tuple[int, Tuple[int, int]]:
+        """
+        Find the best (lowest) rank any two remaining cards make with the board,
+        with a pair of card ids making it.
+        """
+        # Only 3-5 card boards make the 5-7 card hands phevaluator accepts
+        if not 3 <= len(board_ids) <= 5:
+            return 9999, (-1, -1)  # Worst possible hand
+        best, first_id, second_id = min(
+            ((evaluate_cards(*board_ids, first_id, second_id), first_id, second_id)
+             for first_id, second_id in combinations(remaining_ids, 2)),
+            default=(9999, -1, -1),
+        )
+        return best, (first_id, second_id)
+
+
+def best_strength_for_any_hole_cards(board_ids: List[int], remaining_ids: List[int]) -> int:
+    """Find the best (lowest) rank any two remaining cards make with the board."""
+    return best_hand_for_any_hole_cards(board_ids, remaining_ids)[0]
@@ -2,48 +2,58 @@
 
 import os
 import logging
-import json
 from contextlib import asynccontextmanager
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import ValidationError
 
 from models import (
     CalculateRequest, 
     CalculationResponse, 
+    CalculateManyRequest,
+    CalculateManyResponse,
     HealthResponse,
-    OutCard,
     ErrorResponse
 )
 from poker_engine import PokerEngine
+from outs_detector import OutEntry
 from pot_odds_calculator import OptimizedPotOddsCalculator
 
 # Configure logging
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 logging.basicConfig(
     level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    format=LOG_FORMAT
 )
 logger = logging.getLogger(__name__)
 
-# Global instances
-poker_engine = None
-calculator = None
+# Global instances, built at import time so workers forked from a preloaded
+# parent share the engine's deck and lookup tables copy-on-write
+poker_engine = PokerEngine()
+calculator = OptimizedPotOddsCalculator(poker_engine)
+
+# Maximum number of distinct hands kept in the calculation cache
+CALCULATION_CACHE_SIZE = 100_000
+
+# Maximum number of distinct hands kept in the debug breakdown cache
+DEBUG_CACHE_SIZE = 10_000
+
+# Response bodies for results without outs (already nuts, or nothing to draw to),
+# serialized once at import
+NO_OUTS_RESPONSE_BODIES = {
+    pot_odds_ratio: ORJSONResponse({"pot_odds_ratio": pot_odds_ratio, "outs": []}).body
+    for pot_odds_ratio in ("NUTS!", "999.0:1")
+}
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global poker_engine, calculator
-    
     logger.info("Starting Pot Odds Calculator API...")
-    
-    # Initialize components
-    poker_engine = PokerEngine()
-    calculator = OptimizedPotOddsCalculator(poker_engine)
-    
     logger.info("Application startup complete")
     
     yield
@@ -51,25 +61,47 @@ async def lifespan(app: FastAPI):
     logger.info("Application shutdown")
 
 
+@lru_cache(maxsize=CALCULATION_CACHE_SIZE)
+def _cached_calculation(hole_mask: int, community_mask: int) -> Tuple[str, Tuple[OutEntry, ...]]:
+    """
+    Calculate pot odds for a hand given as card bitmasks and memoize the result.
+    
+    Bitmasks are order-independent, so identical hands submitted in any order
+    share one cache entry. Outs are kept as the detector's immutable
+    (card, draw_type) OutEntry tuples, so no per-out dicts are built and cached
+    results cannot be mutated by callers.
+    """
+    return calculator.calculate_pot_odds_mask(hole_mask, community_mask)
+
+
+@lru_cache(maxsize=DEBUG_CACHE_SIZE)
+def _cached_probability_breakdown(hole_mask: int, community_mask: int) -> dict:
+    """Compute and memoize the debug probability breakdown for a hand given as card bitmasks."""
+    hole_cards = poker_engine.mask_to_cards(hole_mask)
+    community_cards = poker_engine.mask_to_cards(community_mask)
+    return calculator.get_probability_breakdown(hole_cards, community_cards)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Pot Odds Calculator API",
     description="High-performance poker pot odds calculation service",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS configuration
-cors_origins = os.getenv("CORS_ORIGINS", '["http://localhost:3000", "http://localhost:3001"]')
-try:
-    origins = json.loads(cors_origins)
-except json.JSONDecodeError:
-    origins = ["http://localhost:3000", "http://localhost:3001"]
-    logger.warning(f"Invalid CORS_ORIGINS format, using default: {origins}")
+# CORS configuration: comma-separated origins, parsed once at import. Brackets
+# and quotes are stripped so the legacy JSON-array format keeps working.
+ORIGINS: Tuple[str, ...] = tuple(
+    origin.strip(' []"\'')
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001").split(",")
+    if origin.strip(' []"\'')
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=list(ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -81,7 +113,7 @@ app.add_middleware(
 async def validation_exception_handler(request: Request, exc: ValidationError):
     """Handle Pydantic validation errors."""
     logger.warning(f"Validation error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={"detail": exc.errors()}
     )
@@ -91,7 +123,7 @@ async def validation_exception_handler(request: Request, exc: ValidationError):
 async def value_error_handler(request: Request, exc: ValueError):
     """Handle value errors (e.g., invalid card notation)."""
     logger.warning(f"Value error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={"detail": str(exc)}
     )
@@ -101,7 +133,7 @@ async def value_error_handler(request: Request, exc: ValueError):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
     logger.error(f"Unexpected error: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error occurred during calculation"}
     )
@@ -116,6 +148,7 @@ async def root():
         "version": "0.1.0",
         "endpoints": {
             "calculate": "/api/calculate",
+            "calculate_many": "/api/calculate_many",
             "health": "/health"
         }
     }
@@ -142,6 +175,17 @@ async def api_info():
                     "hole_cards": ["Ah", "Kh"],
                     "community_cards": ["Qh", "Jh", "Ts"]
                 }
+            },
+            "calculate_pot_odds_many": {
+                "path": "/api/calculate_many",
+                "method": "POST",
+                "description": "Calculate pot odds and outs for up to 1000 hands at once",
+                "example_request": {
+                    "hands": [
+                        {"hole_cards": ["Ah", "Kh"], "community_cards": ["Qh", "Jh", "Ts"]},
+                        {"hole_cards": ["9s", "8s"], "community_cards": ["7h", "6s", "2s"]}
+                    ]
+                }
             }
         },
         "hint": "Did you mean to POST to /api/calculate instead?"
@@ -166,8 +210,8 @@ async def api_post_redirect():
     )
 
 
-@app.post("/api/calculate", response_model=CalculationResponse)
-async def calculate_pot_odds(request: CalculateRequest):
+@app.post("/api/calculate", responses={200: {"model": CalculationResponse}})
+def calculate_pot_odds(request: CalculateRequest):
     """
     Calculate pot odds and identify outs for a poker hand.
     
@@ -178,57 +222,67 @@ async def calculate_pot_odds(request: CalculateRequest):
     
     The pot odds ratio follows the format X.X:1, rounded to first decimal.
     If the decimal is .0, it's shown as integer (e.g., 4:1 instead of 4.0:1).
+    
+    Invalid input raises ValueError and unexpected failures propagate; both are
+    turned into error responses by the app-level exception handlers.
     """
-    try:
-        logger.info(f"Calculating pot odds for hole_cards={request.hole_cards}, "
-                   f"community_cards={request.community_cards}")
-        
-        # Parse cards
-        hole_cards = poker_engine.parse_cards(request.hole_cards)
-        community_cards = poker_engine.parse_cards(request.community_cards)
-        
-        # Validate hand (no duplicates across all cards)
-        all_card_strs = request.hole_cards + request.community_cards
-        if len(all_card_strs) != len(set(all_card_strs)):
-            raise ValueError("Duplicate cards found")
-        
-        # Calculate pot odds and outs
-        pot_odds_ratio, outs_data = calculator.calculate_pot_odds(hole_cards, community_cards)
-        
-        # Convert to response format
-        outs = [OutCard(card=out['card'], draw_type=out['draw_type']) for out in outs_data]
-        
-        response = CalculationResponse(
-            pot_odds_ratio=pot_odds_ratio,
-            outs=outs
-        )
-        
-        logger.info(f"Calculation complete: {len(outs)} outs, ratio={pot_odds_ratio}")
-        
-        return response
-        
-    except ValueError as e:
-        logger.warning(f"Invalid request: {e}")
-        raise HTTPException(status_code=422, detail=str(e))
+    logger.debug("Calculating pot odds for hole_cards=%s, community_cards=%s",
+                 request.hole_cards, request.community_cards)
     
-    except Exception as e:
-        logger.error(f"Calculation error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error during pot odds calculation")
+    # Calculate pot odds and outs (cached by order-independent card bitmasks)
+    hole_mask = poker_engine.parse_cards_to_mask(request.hole_cards)
+    community_mask = poker_engine.parse_cards_to_mask(request.community_cards)
+    pot_odds_ratio, outs_data = _cached_calculation(hole_mask, community_mask)
+    
+    if not outs_data and pot_odds_ratio in NO_OUTS_RESPONSE_BODIES:
+        logger.debug("Calculation complete: 0 outs, ratio=%s", pot_odds_ratio)
+        return Response(NO_OUTS_RESPONSE_BODIES[pot_odds_ratio], media_type="application/json")
+    
+    # Build the CalculationResponse shape directly; engine output is trusted,
+    # so returning the response skips response_model validation and encoding
+    outs = [{"card": card, "draw_type": draw_type} for card, draw_type in outs_data]
+    
+    logger.debug("Calculation complete: %d outs, ratio=%s", len(outs), pot_odds_ratio)
+    
+    return ORJSONResponse({"pot_odds_ratio": pot_odds_ratio, "outs": outs})
+
+
+@app.post("/api/calculate_many", responses={200: {"model": CalculateManyResponse}})
+def calculate_pot_odds_many(request: CalculateManyRequest):
+    """
+    Calculate pot odds and identify outs for several poker hands in one request.
+    
+    Each result has the /api/calculate response shape, in the order the hands
+    were given. Hands go through the same calculation cache as single requests,
+    so a hand repeated within or across requests is only computed once.
+    """
+    logger.debug("Calculating pot odds for %d hands", len(request.hands))
+    
+    results = []
+    for hand in request.hands:
+        hole_mask = poker_engine.parse_cards_to_mask(hand.hole_cards)
+        community_mask = poker_engine.parse_cards_to_mask(hand.community_cards)
+        pot_odds_ratio, outs_data = _cached_calculation(hole_mask, community_mask)
+        results.append({
+            "pot_odds_ratio": pot_odds_ratio,
+            "outs": [{"card": card, "draw_type": draw_type} for card, draw_type in outs_data]
+        })
+    
+    return ORJSONResponse({"results": results})
 
 
 # Development and debugging endpoints (only in debug mode)
 @app.get("/api/debug/examples")
-async def debug_examples():
+def debug_examples():
     """Debug endpoint to show calculation examples."""
     if os.getenv("LOG_LEVEL") != "DEBUG":
         raise HTTPException(status_code=404, detail="Not found")
     
-    examples = calculator.calculate_exact_odds_from_examples()
-    return examples
+    return calculator.calculate_exact_odds_from_examples()
 
 
 @app.get("/api/debug/probability/{hole_cards}/{community_cards}")
-async def debug_probability_breakdown(hole_cards: str, community_cards: str = ""):
+def debug_probability_breakdown(hole_cards: str, community_cards: str = ""):
     """Debug endpoint for probability breakdown."""
     if os.getenv("LOG_LEVEL") != "DEBUG":
         raise HTTPException(status_code=404, detail="Not found")
@@ -237,10 +291,14 @@ async def debug_probability_breakdown(hole_cards: str, community_cards: str = ""
         hole_list = hole_cards.split(",")
         community_list = community_cards.split(",") if community_cards else []
         
-        hole_card_objects = poker_engine.parse_cards(hole_list)
-        community_card_objects = poker_engine.parse_cards(community_list)
+        hole_mask = poker_engine.parse_cards_to_mask(hole_list)
+        community_mask = poker_engine.parse_cards_to_mask(community_list)
+        
+        # Masks collapse repeated cards, so a duplicate shows up as a missing bit
+        if hole_mask & community_mask or bin(hole_mask | community_mask).count("1") != len(hole_list) + len(community_list):
+            raise ValueError("Duplicate cards found")
         
-        breakdown = calculator.get_probability_breakdown(hole_card_objects, community_card_objects)
+        breakdown = _cached_probability_breakdown(hole_mask, community_mask)
         return breakdown
         
     except Exception as e:
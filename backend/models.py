@@ -2,10 +2,12 @@
 
 from typing import List
 from pydantic import BaseModel, Field, field_validator, model_validator
-import re
 
-# Card notation regex pattern
-CARD_PATTERN = re.compile(r'^[2-9TJQKA][shdc]$')
+# All 52 legal card notations (rank followed by suit)
+VALID_CARDS = frozenset(rank + suit for rank in "23456789TJQKA" for suit in "shdc")
+
+# Maximum number of hands accepted by one batch calculation request
+MAX_BATCH_HANDS = 1000
 
 
 class CalculateRequest(BaseModel):
@@ -30,14 +32,12 @@ class CalculateRequest(BaseModel):
         """Validate card notation and check for duplicates."""
         if not cards:
             return cards
-            
-        # Validate card notation
-        for card in cards:
-            if not CARD_PATTERN.match(card):
-                raise ValueError(f"Invalid card notation: {card}. Use format like 'As', 'Kh', '7d'")
         
-        # Check for duplicates
-        if len(cards) != len(set(cards)):
+        # One subset test covers every card; the loop only runs to name a bad one
+        if not VALID_CARDS.issuperset(cards):
+            invalid = next(card for card in cards if card not in VALID_CARDS)
+            raise ValueError(f"Invalid card notation: {invalid}. Use format like 'As', 'Kh', '7d'")
+        if len(set(cards)) != len(cards):
             raise ValueError("Duplicate cards are not allowed")
         
         return cards
@@ -45,12 +45,23 @@ class CalculateRequest(BaseModel):
     @model_validator(mode='after')
     def validate_no_duplicate_across_all_cards(self):
         """Ensure no duplicates across hole cards and community cards."""
-        all_cards = self.hole_cards + self.community_cards
-        if len(all_cards) != len(set(all_cards)):
+        # Each list was already checked for duplicates of its own
+        if not set(self.hole_cards).isdisjoint(self.community_cards):
             raise ValueError("Duplicate cards found across hole cards and community cards")
         return self
 
 
+class CalculateManyRequest(BaseModel):
+    """Request model for calculating pot odds for several hands at once."""
+    
+    hands: List[CalculateRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_HANDS,
+        description="Hands to calculate, each shaped like a single calculation request"
+    )
+
+
 class OutCard(BaseModel):
     """Model for an out card with its draw type."""
     
@@ -67,7 +78,7 @@ class OutCard(BaseModel):
     @classmethod
     def validate_card_notation(cls, card):
         """Validate card notation."""
-        if not CARD_PATTERN.match(card):
+        if card not in VALID_CARDS:
             raise ValueError(f"Invalid card notation: {card}")
         return card
 
@@ -85,6 +96,15 @@ class CalculationResponse(BaseModel):
     )
 
 
+class CalculateManyResponse(BaseModel):
+    """Response model for a batch pot odds calculation."""
+    
+    results: List[CalculationResponse] = Field(
+        ...,
+        description="One calculation result per requested hand, in request order"
+    )
+
+
 class HealthResponse(BaseModel):
     """Health check response model."""
     
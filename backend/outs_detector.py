@@ -1,11 +1,90 @@
 """Outs detection algorithm with draw type classification."""
 
-from typing import List, Dict, Tuple
-from poker_engine import PokerEngine, Card
+from functools import lru_cache
+from typing import List, Dict, Tuple, NamedTuple, Optional
+from phevaluator import evaluate_cards
+from poker_engine import PokerEngine, Card, CARD_STRINGS, SUIT_CARD_MASKS
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Distinct (hole, board) hands whose outs each detector keeps memoized
+FIND_OUTS_CACHE_SIZE = 65_536
+
+# Draw types from strongest to weakest; outs are listed in this order
+DRAW_TYPES = (
+    'royal flush',
+    'straight flush',
+    'flush',
+    'straight',
+    'pair',
+    'three of a kind',
+    'four of a kind',
+    'full house',
+    'two pair',
+)
+# Priority of each draw type (its index in DRAW_TYPES); lower is stronger
+(
+    ROYAL_FLUSH, STRAIGHT_FLUSH, FLUSH, STRAIGHT, PAIR,
+    THREE_OF_A_KIND, FOUR_OF_A_KIND, FULL_HOUSE, TWO_PAIR,
+) = range(len(DRAW_TYPES))
+NO_DRAW = len(DRAW_TYPES)
+
+
+def _rank_mask(ranks: List[int]) -> int:
+    """Encode card values (2-14) as a rank bitmask with bit n set for value n."""
+    mask = 0
+    for rank in ranks:
+        mask |= 1 << rank
+    return mask
+
+
+# All possible 5-card straights as rank bitmasks, lowest to highest, then the wheel
+STRAIGHT_MASKS = tuple(
+    [_rank_mask(range(low, low + 5)) for low in range(2, 11)]
+    + [_rank_mask([2, 3, 4, 5, 14])]  # wheel (A-5)
+)
+# Royal flush ranks: T, J, Q, K, A
+ROYAL_MASK = _rank_mask([10, 11, 12, 13, 14])
+# Straight flushes exclude the A-high straight, which is handled as a royal flush
+STRAIGHT_FLUSH_MASKS = tuple(mask for mask in STRAIGHT_MASKS if mask != ROYAL_MASK)
+
+
+# There are only 2**13 rank masks, so the per-mask answers below are computed once
+# and then shared by every hand with the same ranks.
+@lru_cache(maxsize=None)
+def straight_completions(rank_mask: int, straight_masks: Tuple[int, ...] = STRAIGHT_MASKS) -> int:
+    """Ranks completing a straight: straights missing exactly 1 card (4 of 5 present)."""
+    completing = 0
+    for straight_mask in straight_masks:
+        missing = straight_mask & ~rank_mask
+        if missing.bit_count() == 1:
+            completing |= missing
+    return completing
+
+
+@lru_cache(maxsize=None)
+def mask_ranks(mask: int) -> Tuple[int, ...]:
+    """List the ranks set in a rank bitmask, lowest first."""
+    return tuple(rank for rank in range(2, 15) if mask >> rank & 1)
+
+
+class OutEntry(NamedTuple):
+    """A single out: the card that completes the draw and the draw type it makes."""
+    
+    card: str
+    draw_type: str
+
+
+class HandContext(NamedTuple):
+    """Per-hand data shared by _find_overcard_outs and _find_improvement_outs."""
+    
+    deck_by_rank: Dict[int, List[Card]]
+    suit_counts: bytearray
+    rank_counts: bytearray
+    straight_out_count: int
+    board_rank_counts: bytearray
+
 
 class OutsDetector:
     """Detects outs and classifies draw types for poker hands."""
@@ -13,6 +92,7 @@ class OutsDetector:
     def __init__(self, poker_engine: PokerEngine):
         """Initialize outs detector with poker engine."""
         self.engine = poker_engine
+        self._find_outs_cached = lru_cache(maxsize=FIND_OUTS_CACHE_SIZE)(self._find_outs_for_masks)
     
     def find_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Dict[str, str]]:
         """
@@ -21,394 +101,286 @@ class OutsDetector:
         
         An 'out' is specifically a card that creates a strong draw (straight, flush, 
         top pair, trips, etc.) that would likely win the pot - not just any improvement.
-        """
-        # Get current hand strength for validation
-        current_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
         
-        outs = []
-        outs_dict = {}  # Track cards with their best draw type
-        
-        # Find royal flush draws FIRST (highest priority - special case of straight flush)
-        royal_flush_outs = self._find_royal_flush_outs(hole_cards, community_cards)
-        for card_str, draw_type in royal_flush_outs:
-            if self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                outs_dict[card_str] = 'royal flush'  # Royal flush has highest priority
-        
-        # Find straight flush draws (second highest priority)
-        straight_flush_outs = self._find_straight_flush_outs(hole_cards, community_cards)
-        for card_str, draw_type in straight_flush_outs:
-            # Only add if not already a royal flush out
-            if card_str not in outs_dict and self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                outs_dict[card_str] = 'straight flush'
-        
-        # Find flush draws (9 outs)
-        flush_outs = self._find_flush_outs(hole_cards, community_cards)
-        for card_str, draw_type in flush_outs:
-            # Only add if not already a royal/straight flush out
-            if card_str not in outs_dict and self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                outs_dict[card_str] = draw_type
-        
-        # Find straight draws (4 or 8 outs)
-        straight_outs = self._find_straight_outs(hole_cards, community_cards)
-        for card_str, draw_type in straight_outs:
-            if card_str not in outs_dict and self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                outs_dict[card_str] = draw_type
-        
-        # Find overcard outs (typically 6 outs for two overcards)
-        overcard_outs = self._find_overcard_outs(hole_cards, community_cards)
-        for card_str, draw_type in overcard_outs:
-            if card_str not in outs_dict and self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                outs_dict[card_str] = 'pair'  # Overcards make pairs
-        
-        # Find set/trips to full house or quads (4-7 outs)
-        improvement_outs = self._find_improvement_outs(hole_cards, community_cards)
-        for card_str, draw_type in improvement_outs:
-            if card_str not in outs_dict and self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                # Normalize the draw type  
-                normalized_type = draw_type.replace('_', ' ')
-                outs_dict[card_str] = normalized_type
-        
-        # Find two-pair outs (when unpaired hole cards can pair with board)
-        two_pair_outs = self._find_two_pair_outs(hole_cards, community_cards)
-        for card_str, draw_type in two_pair_outs:
-            if card_str not in outs_dict and self._validates_as_out(hole_cards, community_cards, card_str, current_strength):
-                outs_dict[card_str] = 'two pair'
-        
-        # Convert dict to list of dicts
-        for card_str, draw_type in outs_dict.items():
-            outs.append({'card': card_str, 'draw_type': draw_type})
+        Results are memoized by the (hole, board) card masks, so repeated hands skip
+        the search entirely.
+        """
+        return [
+            {'card': card_str, 'draw_type': draw_type}
+            for card_str, draw_type in self.find_out_entries(hole_cards, community_cards)
+        ]
+    
+    def find_out_entries(self, hole_cards: List[Card], community_cards: List[Card]) -> Tuple[OutEntry, ...]:
+        """
+        Find outs like find_outs, as the cached immutable tuple of OutEntry.
         
-        return outs
+        Use this internally when the dict shape isn't needed; it allocates nothing
+        per out for hands already seen.
+        """
+        return self._find_outs_cached(
+            self.engine.cards_to_mask(hole_cards), self.engine.cards_to_mask(community_cards)
+        )
     
-    def _validates_as_out(self, hole_cards: List[Card], community_cards: List[Card], card_str: str, current_strength: int) -> bool:
-        """Validate that a potential out actually improves the hand strength."""
-        try:
-            out_card = Card(card_str)
-            new_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards + [out_card])
-            # Lower rank = better hand in phevaluator
-            return new_strength < current_strength
-        except:
-            return False
+    def _find_outs_for_masks(self, hole_mask: int, board_mask: int) -> Tuple[OutEntry, ...]:
+        """Find outs for a hand given as card masks."""
+        hole_cards = self.engine.mask_to_cards(hole_mask)
+        community_cards = self.engine.mask_to_cards(board_mask)
+        return tuple(self._find_outs(hole_cards, community_cards))
     
-    def _find_flush_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
-        """Find cards that complete a flush draw or improve an existing flush."""
-        outs = []
+    def _find_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[OutEntry]:
+        """
+        Classify every remaining card in a single pass and return the validated outs.
+        
+        The hand is summarized once (per-suit rank masks, rank counts, straight
+        completions), so each remaining card needs only a few bit tests to find its
+        strongest draw type. A card is a candidate out when it makes:
+        
+        - royal flush: the missing card of a suit holding 4 of T-J-Q-K-A
+        - straight flush: the missing card of any other 5-rank run held 4/5 in one suit
+        - flush: any card of a suit with 4+ known cards (a draw or a made flush)
+        - straight: any card of a rank that completes a straight (4 of 5 ranks held)
+        - pair: a card pairing a hole card above the whole board, unless a 4-card
+          flush draw or 4+ straight outs take priority
+        - three of a kind: a card matching a held pair, unless the board is paired
+          and that pair uses a board card
+        - four of a kind: a card matching held trips
+        - full house: with trips held, a card pairing any other held rank
+        - two pair: on a paired board, a card pairing an unpaired hole card, unless
+          two or more ranks are already paired
+        
+        Candidates only count when the evaluator ranks the new hand stronger. Outs
+        are ordered by draw type priority (DRAW_TYPES), then deck order.
+        """
         all_cards = hole_cards + community_cards
-        
-        # Count cards by suit
-        suit_counts = {}
+        num_suits = len(Card.SUITS)
+        known_mask = 0
+        rank_mask = 0
+        suit_counts = [0] * num_suits
+        suit_rank_masks = [0] * num_suits
+        # Rank counts as value-indexed bytearrays (see count_rank_occurrences_array)
+        rank_counts = bytearray(15)
+        board_rank_counts = bytearray(15)
         for card in all_cards:
-            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
-        
-        # Find suits with 4 or more cards (flush draws or completed flushes)
-        for suit, count in suit_counts.items():
-            if count >= 4:
-                # Find all remaining cards of this suit
-                remaining_deck = self.engine.get_remaining_deck(all_cards)
-                for card in remaining_deck:
-                    if card.suit == suit:
-                        # For both completed flushes and flush draws, classify as flush
-                        draw_type = 'flush'
-                        outs.append((str(card), draw_type))
-        
-        return outs
+            suit_index = card.index % num_suits
+            known_mask |= card.mask
+            rank_mask |= 1 << card.value
+            suit_counts[suit_index] += 1
+            suit_rank_masks[suit_index] |= 1 << card.value
+            rank_counts[card.value] += 1
+        for card in community_cards:
+            board_rank_counts[card.value] += 1
+        board_has_pair = max(board_rank_counts) >= 2
+        
+        # Strongest suit-based draw per suit, and the royal flush / straight flush
+        # completing ranks for each suit
+        suit_draws = [FLUSH if count >= 4 else NO_DRAW for count in suit_counts]
+        royal_missing = [0] * num_suits
+        straight_flush_ranks = [0] * num_suits
+        for suit_index, suit_mask in enumerate(suit_rank_masks):
+            royal_cards_held = suit_mask & ROYAL_MASK
+            if royal_cards_held.bit_count() >= 4:
+                royal_missing[suit_index] = ROYAL_MASK & ~royal_cards_held
+            straight_flush_ranks[suit_index] = straight_completions(suit_mask, STRAIGHT_FLUSH_MASKS)
+        
+        # Strongest rank-based draw per card value. Every rule claims values with
+        # min(), so the rules can run in any order.
+        rank_draws = [NO_DRAW] * 15
+        # Straight draws (4 or 8 outs)
+        straight_ranks = mask_ranks(straight_completions(rank_mask))
+        for value in straight_ranks:
+            rank_draws[value] = min(rank_draws[value], STRAIGHT)
+        # Overcards make pairs, unless a flush draw or 4+ straight outs take priority
+        if community_cards and 4 not in suit_counts:
+            straight_out_count = sum(4 - rank_counts[value] for value in straight_ranks)
+            if straight_out_count < 4:
+                highest_board = max(card.value for card in community_cards)
+                for card in hole_cards:
+                    if card.value > highest_board:
+                        rank_draws[card.value] = min(rank_draws[card.value], PAIR)
+        # Set/trips to full house or quads, pairs to trips (skipped on paired boards)
+        has_trips = 3 in rank_counts
+        for value in range(2, 15):
+            count = rank_counts[value]
+            if count == 1 and has_trips:
+                rank_draws[value] = min(rank_draws[value], FULL_HOUSE)
+            elif count == 2 and not (board_has_pair and board_rank_counts[value] >= 1):
+                rank_draws[value] = min(rank_draws[value], THREE_OF_A_KIND)
+            elif count == 3:
+                rank_draws[value] = min(rank_draws[value], FOUR_OF_A_KIND)
+        # Unpaired hole cards pairing with a paired board, unless we have two pair already
+        if board_has_pair and sum(1 for count in rank_counts if count >= 2) < 2:
+            for card in hole_cards:
+                if rank_counts[card.value] < 2:
+                    rank_draws[card.value] = min(rank_draws[card.value], TWO_PAIR)
+        
+        # Single pass over the remaining deck, keeping each card's strongest draw
+        candidates = []
+        for card in self.engine.deck:
+            if card.mask & known_mask:
+                continue
+            suit_index = card.index % num_suits
+            rank_bit = 1 << card.value
+            if royal_missing[suit_index] & rank_bit:
+                priority = ROYAL_FLUSH
+            elif straight_flush_ranks[suit_index] & rank_bit:
+                priority = STRAIGHT_FLUSH
+            else:
+                priority = min(suit_draws[suit_index], rank_draws[card.value])
+            if priority != NO_DRAW:
+                candidates.append((priority, card.index))
+        candidates.sort()
+        
+        # Validate every candidate in one batch, keeping priority order
+        current_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
+        known_ids = tuple(card.index for card in all_cards)
+        valid = self._validate_outs(known_ids, [card_id for _, card_id in candidates], current_strength)
+        return [
+            OutEntry(CARD_STRINGS[card_id], DRAW_TYPES[priority])
+            for (priority, card_id), is_out in zip(candidates, valid)
+            if is_out
+        ]
     
-    def _find_straight_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
-        """Find cards that complete straight draws (gutshot=4 outs, open-ended=8 outs)."""
-        outs = []
+    def _build_context(self, hole_cards: List[Card], community_cards: List[Card]) -> HandContext:
+        """Compute the remaining cards by rank and the suit/rank counts for a hand in one place."""
         all_cards = hole_cards + community_cards
-        ranks = sorted(set(card.value for card in all_cards))
-        remaining_deck = self.engine.get_remaining_deck(all_cards)
-        
-        # All possible 5-card straights
-        possible_straights = [
-            [2, 3, 4, 5, 6],   # 6-high
-            [3, 4, 5, 6, 7],   # 7-high  
-            [4, 5, 6, 7, 8],   # 8-high
-            [5, 6, 7, 8, 9],   # 9-high
-            [6, 7, 8, 9, 10],  # 10-high
-            [7, 8, 9, 10, 11], # J-high
-            [8, 9, 10, 11, 12], # Q-high
-            [9, 10, 11, 12, 13], # K-high
-            [10, 11, 12, 13, 14], # A-high
-            [2, 3, 4, 5, 14]   # wheel (A-5)
-        ]
-        
-        straight_completing_ranks = set()
-        
-        for straight in possible_straights:
-            missing = [rank for rank in straight if rank not in ranks]
-            
-            # Only count straights missing exactly 1 card
-            if len(missing) == 1:
-                missing_rank = missing[0]
-                
-                # Check if we have exactly 4 cards from this straight
-                present = [rank for rank in straight if rank in ranks]
-                if len(present) == 4:
-                    straight_completing_ranks.add(missing_rank)
-        
-        # Convert ranks to actual cards
-        for rank in straight_completing_ranks:
-            for card in remaining_deck:
-                if card.value == rank:
-                    # Determine if it's gutshot (inside) or open-ended
-                    draw_type = self._classify_straight_draw(rank, ranks)
-                    outs.append((str(card), draw_type))
-        
-        return outs
+        known_mask = self.engine.cards_to_mask(all_cards)
+        rank_counts = self.engine.count_rank_occurrences_array(all_cards)
+        board_rank_counts = self.engine.count_rank_occurrences_array(community_cards)
+        rank_mask = 0
+        for card in all_cards:
+            rank_mask |= 1 << card.value
+        
+        # Index the remaining deck by rank so helpers can look cards up instead of scanning
+        deck_by_rank = {}
+        for card in self.engine.deck:
+            if not card.mask & known_mask:
+                deck_by_rank.setdefault(card.value, []).append(card)
+        
+        return HandContext(
+            deck_by_rank=deck_by_rank,
+            suit_counts=self.engine.count_suit_occurrences_array(all_cards),
+            rank_counts=rank_counts,
+            straight_out_count=sum(4 - rank_counts[rank] for rank in mask_ranks(straight_completions(rank_mask))),
+            board_rank_counts=board_rank_counts,
+        )
     
-    def _classify_straight_draw(self, completing_rank: int, current_ranks: List[int]) -> str:
-        """Classify straight draws - returns 'straight' for both gutshot and open-ended."""
-        # Return 'straight' for all straight draws, keeping the detail in descriptions
-        return 'straight'
+    def _validate_outs(self, known_ids: Tuple[int, ...], card_ids: List[int], current_strength: int) -> List[bool]:
+        """
+        Validate which potential outs actually improve the hand strength.
+        
+        Evaluates Card.index ids directly with phevaluator's integer API, skipping
+        string parsing. Its ids use the same rank * 4 + suit layout; only the suit
+        order differs, which cannot change a hand's rank. Hands outside phevaluator's
+        5-7 card range never validate, matching evaluate_hand_strength's 9999 fallback.
+        """
+        if not 4 <= len(known_ids) <= 6:
+            return [False] * len(card_ids)
+        # Lower rank = better hand in phevaluator
+        return [evaluate_cards(*known_ids, card_id) < current_strength for card_id in card_ids]
     
-    def _find_overcard_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
+    def _find_overcard_outs(self, hole_cards: List[Card], community_cards: List[Card], ctx: Optional[HandContext] = None) -> List[Tuple[Card, str]]:
         """Find overcards that would make top pair (typically 6 outs for two overcards)."""
         outs = []
         
         if not community_cards:  # Pre-flop, no overcards to consider
             return outs
         
+        # Find highest card on board; without an overcard there is nothing else to check
+        highest_board = max(card.value for card in community_cards)
+        overcard_ranks = [card.value for card in hole_cards if card.value > highest_board]
+        if not overcard_ranks:
+            return outs
+        
         # Check if we already have a stronger draw (like flush draw or strong straight draw)
         # If we have a strong draw, don't count overcards
-        all_cards = hole_cards + community_cards
-        
-        # Check for flush draws (exactly 4 cards of same suit)
-        suit_counts = {}
-        for card in all_cards:
-            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
+        ctx = ctx or self._build_context(hole_cards, community_cards)
         
         # If we have a flush draw (exactly 4 cards of same suit), don't count overcards
         # But allow overcards if we already have completed flush (5+ cards)
-        for count in suit_counts.values():
-            if count == 4:
-                return outs  # Return empty list - flush draw takes priority
+        if 4 in ctx.suit_counts:
+            return outs  # Return empty list - flush draw takes priority
         
         # Check for straight draws - if we have a strong straight draw, don't count overcards
-        straight_outs = self._find_straight_outs(hole_cards, community_cards)
-        if len(straight_outs) >= 4:  # If we have 4+ straight outs, prioritize that
+        if ctx.straight_out_count >= 4:  # If we have 4+ straight outs, prioritize that
             return outs  # Return empty list - straight draw takes priority
         
-        # Find highest card on board
-        board_ranks = [card.value for card in community_cards]
-        highest_board = max(board_ranks)
-        
-        # Check hole cards for overcards
-        hole_ranks = [card.value for card in hole_cards]
-        remaining_deck = self.engine.get_remaining_deck(hole_cards + community_cards)
-        
-        for hole_rank in hole_ranks:
-            if hole_rank > highest_board:
-                # This is an overcard - count remaining cards of this rank
-                for card in remaining_deck:
-                    if card.value == hole_rank:
-                        outs.append((str(card), 'overcard'))
+        for hole_rank in overcard_ranks:
+            # This is an overcard - count remaining cards of this rank
+            for card in ctx.deck_by_rank.get(hole_rank, ()):
+                outs.append((card, 'overcard'))
         
         return outs
     
-    def _find_improvement_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
+    def _find_improvement_outs(self, hole_cards: List[Card], community_cards: List[Card], ctx: Optional[HandContext] = None) -> List[Tuple[Card, str]]:
         """Find outs for sets to full house/quads, pairs to trips, etc."""
         outs = []
-        all_cards = hole_cards + community_cards
-        rank_counts = self.engine.count_rank_occurrences(all_cards)
-        remaining_deck = self.engine.get_remaining_deck(all_cards)
+        ctx = ctx or self._build_context(hole_cards, community_cards)
+        rank_counts = ctx.rank_counts
+        deck_by_rank = ctx.deck_by_rank
         
         # Check if board is paired (has any rank with count >= 2 in community cards only)
-        board_rank_counts = self.engine.count_rank_occurrences(community_cards)
-        board_has_pair = any(count >= 2 for count in board_rank_counts.values())
+        board_rank_counts = ctx.board_rank_counts
+        board_has_pair = max(board_rank_counts) >= 2
         
-        for rank, count in rank_counts.items():
+        for rank in range(2, 15):
+            count = rank_counts[rank]
             if count == 2:  # Pair can become trips
                 # Skip trips outs on paired boards - not "likely to win" due to full house threats
-                if board_has_pair and board_rank_counts.get(rank, 0) >= 1:
+                if board_has_pair and board_rank_counts[rank] >= 1:
                     # This pair involves board cards on an already paired board - skip
                     continue
                     
-                for card in remaining_deck:
-                    if card.value == rank:
-                        outs.append((str(card), 'three of a kind'))
+                for card in deck_by_rank.get(rank, ()):
+                    outs.append((card, 'three of a kind'))
             elif count == 3:  # Trips can become quads or make full house
                 # Quads
-                for card in remaining_deck:
-                    if card.value == rank:
-                        outs.append((str(card), 'four of a kind'))
+                for card in deck_by_rank.get(rank, ()):
+                    outs.append((card, 'four of a kind'))
                 
                 # Full house - need another pair
-                for other_rank, other_count in rank_counts.items():
-                    if other_rank != rank and other_count >= 1:
-                        for card in remaining_deck:
-                            if card.value == other_rank:
-                                # Only count if it would make a new pair (not already counted)
-                                current_count = rank_counts.get(other_rank, 0)
-                                if current_count == 1:  # Making a second pair for full house
-                                    outs.append((str(card), 'full house'))
-        
-        return outs
-    
-    def _find_two_pair_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
-        """Find outs where unpaired hole cards can pair to make meaningful two-pair hands."""
-        outs = []
-        
-        if len(community_cards) == 0:
-            return outs  # No community cards to pair with
-            
-        # Get rank counts for all cards and board only
-        all_cards = hole_cards + community_cards
-        all_rank_counts = self.engine.count_rank_occurrences(all_cards)
-        board_rank_counts = self.engine.count_rank_occurrences(community_cards)
-        hole_rank_counts = self.engine.count_rank_occurrences(hole_cards)
-        remaining_deck = self.engine.get_remaining_deck(all_cards)
-        
-        # Only proceed if we don't already have a pair or better
-        # (two-pair outs are only relevant when we have high card or single pair)
-        has_pair_or_better = any(count >= 2 for count in all_rank_counts.values())
-        
-        # If we already have two pair or better, two-pair outs aren't meaningful
-        if sum(1 for count in all_rank_counts.values() if count >= 2) >= 2:
-            return outs
-        
-        # Find unpaired hole cards that can pair with board ranks to make two pair
-        for hole_card in hole_cards:
-            hole_rank = hole_card.value
-            
-            # Skip if this hole card rank is already paired (count >= 2)
-            if all_rank_counts.get(hole_rank, 0) >= 2:
-                continue
-                
-            # Check if this hole card can pair to make meaningful two-pair
-            # We need at least one pair on board to make two-pair meaningful
-            if not any(count >= 2 for count in board_rank_counts.values()):
-                continue
-                
-            # Count remaining cards of this rank as outs
-            for card in remaining_deck:
-                if card.value == hole_rank:
-                    outs.append((str(card), 'two pair'))
-                    
-        return outs
-    
-    def _find_straight_flush_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
-        """Find cards that complete a straight flush draw (non-royal)."""
-        outs = []
-        all_cards = hole_cards + community_cards
-        
-        # Group cards by suit
-        suit_cards = {}
-        for card in all_cards:
-            if card.suit not in suit_cards:
-                suit_cards[card.suit] = []
-            suit_cards[card.suit].append(card.value)
-        
-        # All possible 5-card straights (excluding royal)
-        possible_straights = [
-            [2, 3, 4, 5, 6],   # 6-high
-            [3, 4, 5, 6, 7],   # 7-high  
-            [4, 5, 6, 7, 8],   # 8-high
-            [5, 6, 7, 8, 9],   # 9-high
-            [6, 7, 8, 9, 10],  # 10-high
-            [7, 8, 9, 10, 11], # J-high
-            [8, 9, 10, 11, 12], # Q-high
-            [9, 10, 11, 12, 13], # K-high
-            # Skip [10, 11, 12, 13, 14] as that's royal flush
-            [2, 3, 4, 5, 14]   # wheel (A-5)
-        ]
-        
-        remaining_deck = self.engine.get_remaining_deck(all_cards)
-        
-        # Check each suit for straight flush potential
-        for suit, ranks in suit_cards.items():
-            ranks_set = set(ranks)
-            
-            # Check each possible straight
-            for straight in possible_straights:
-                missing = [rank for rank in straight if rank not in ranks_set]
-                
-                # Need exactly 4 cards from this straight in the same suit
-                if len(missing) == 1:
-                    missing_rank = missing[0]
-                    # Find the card of this rank and suit
-                    for card in remaining_deck:
-                        if card.value == missing_rank and card.suit == suit:
-                            outs.append((str(card), 'straight flush'))
-        
-        return outs
-    
-    def _find_royal_flush_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[Tuple[str, str]]:
-        """Find cards that complete a royal flush draw (A, K, Q, J, 10 of same suit)."""
-        outs = []
-        all_cards = hole_cards + community_cards
-        
-        # Royal flush cards for each suit
-        royal_ranks = [14, 13, 12, 11, 10]  # A, K, Q, J, 10
-        
-        # Group cards by suit
-        suit_cards = {}
-        for card in all_cards:
-            if card.suit not in suit_cards:
-                suit_cards[card.suit] = set()
-            suit_cards[card.suit].add(card.value)
-        
-        # Check each suit for royal flush potential
-        remaining_deck = self.engine.get_remaining_deck(all_cards)
-        
-        for suit, ranks in suit_cards.items():
-            # Check how many royal cards we have in this suit
-            royal_cards_held = ranks.intersection(set(royal_ranks))
-            
-            # Need at least 4 royal cards to have a royal flush draw
-            if len(royal_cards_held) >= 4:
-                # Find the missing royal card(s)
-                missing_royal = set(royal_ranks) - royal_cards_held
-                
-                # Add the missing royal card(s) as outs if available in deck
-                for missing_rank in missing_royal:
-                    for card in remaining_deck:
-                        if card.value == missing_rank and card.suit == suit:
-                            outs.append((str(card), 'royal flush'))
+                for other_rank in range(2, 15):
+                    # Only count if it would make a new pair (not already counted)
+                    if other_rank != rank and rank_counts[other_rank] == 1:  # Making a second pair for full house
+                        for card in deck_by_rank.get(other_rank, ()):
+                            outs.append((card, 'full house'))
         
         return outs
     
     def count_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> int:
         """Get the total number of outs for the given hand."""
-        outs = self.find_outs(hole_cards, community_cards)
-        return len(outs)
-    
+        return len(self.find_out_entries(hole_cards, community_cards))
     
     def _analyze_flush_draws(self, hole_cards: List[Card], community_cards: List[Card]) -> Dict[str, List[str]]:
         """Analyze flush draws and return cards that complete them."""
-        # Use the new flush outs method
-        flush_outs_list = self._find_flush_outs(hole_cards, community_cards)
+        all_cards = hole_cards + community_cards
+        known_mask = self.engine.cards_to_mask(all_cards)
+        suit_counts = self.engine.count_suit_occurrences_array(all_cards)
         
-        # Group by suit for backward compatibility
+        # Remaining cards of every suit with 4+ known cards, grouped by suit in
+        # order of first appearance; strings are only built for the result
         flush_outs = {}
-        for card_str, draw_type in flush_outs_list:
-            suit = card_str[1]  # Get suit from card string (e.g., 'As' -> 's')
-            if suit not in flush_outs:
-                flush_outs[suit] = []
-            flush_outs[suit].append(card_str)
+        for card in all_cards:
+            if suit_counts[card.suit_index] >= 4 and card.suit not in flush_outs:
+                remaining_mask = SUIT_CARD_MASKS[card.suit_index] & ~known_mask
+                flush_outs[card.suit] = [CARD_STRINGS[out.index] for out in self.engine.mask_to_cards(remaining_mask)]
         
         return flush_outs
     
     def _analyze_straight_draws(self, hole_cards: List[Card], community_cards: List[Card]) -> List[int]:
-        """Analyze straight draws and return ranks that complete them."""
-        # Use the new straight outs method and extract ranks
-        straight_outs_list = self._find_straight_outs(hole_cards, community_cards)
-        
-        # Extract unique ranks from the card strings
-        ranks = set()
-        for card_str, draw_type in straight_outs_list:
-            # Convert card string back to rank value
-            card = Card(card_str)
-            ranks.add(card.value)
-        
-        return list(ranks)
+        """Analyze straight draws and return ranks that complete them, lowest first."""
+        rank_mask = 0
+        for card in hole_cards + community_cards:
+            rank_mask |= 1 << card.value
+        
+        # A completing rank isn't held, so all four of its cards are still live
+        return list(mask_ranks(straight_completions(rank_mask)))
     
     def _get_pairing_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> Dict[str, List[int]]:
         """Get outs that make pairs, trips, or quads - only for meaningful improvements."""
-        # Use new methods to get overcard and improvement outs
-        overcard_outs = self._find_overcard_outs(hole_cards, community_cards)
-        improvement_outs = self._find_improvement_outs(hole_cards, community_cards)
+        # Use new methods to get overcard and improvement outs, sharing one hand summary
+        ctx = self._build_context(hole_cards, community_cards)
+        overcard_outs = self._find_overcard_outs(hole_cards, community_cards, ctx)
+        improvement_outs = self._find_improvement_outs(hole_cards, community_cards, ctx)
         
         # Categorize by improvement type
         pair_outs = []
@@ -416,13 +388,11 @@ class OutsDetector:
         quads_outs = []
         
         # Process overcard outs (these make top pair)
-        for card_str, draw_type in overcard_outs:
-            card = Card(card_str)
+        for card, draw_type in overcard_outs:
             pair_outs.append(card.value)
         
         # Process improvement outs
-        for card_str, draw_type in improvement_outs:
-            card = Card(card_str)
+        for card, draw_type in improvement_outs:
             if draw_type == 'three of a kind':
                 trips_outs.append(card.value)
             elif draw_type == 'four of a kind':
@@ -439,23 +409,20 @@ class OutsDetector:
     
     def get_detailed_outs_analysis(self, hole_cards: List[Card], community_cards: List[Card]) -> Dict:
         """Get detailed analysis of all possible outs by category."""
-        # Use the main find_outs method for accurate counting
-        outs_list = self.find_outs(hole_cards, community_cards)
+        # Use the main find_outs results for accurate counting
+        outs_list = self.find_out_entries(hole_cards, community_cards)
         
         analysis = {
             'flush_draws': self._analyze_flush_draws(hole_cards, community_cards),
             'straight_draws': self._analyze_straight_draws(hole_cards, community_cards),
             'pairing_outs': self._get_pairing_outs(hole_cards, community_cards),
             'total_outs': len(outs_list),
-            'unique_out_cards': [out['card'] for out in outs_list],
+            'unique_out_cards': [out.card for out in outs_list],
             'outs_by_type': {}
         }
         
         # Group outs by draw type
         for out in outs_list:
-            draw_type = out['draw_type']
-            if draw_type not in analysis['outs_by_type']:
-                analysis['outs_by_type'][draw_type] = []
-            analysis['outs_by_type'][draw_type].append(out['card'])
+            analysis['outs_by_type'].setdefault(out.draw_type, []).append(out.card)
         
         return analysis
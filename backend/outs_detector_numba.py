@@ -0,0 +1,221 @@
+"""Numba-compiled outs detection pipeline."""
+
+from typing import List
+from phevaluator import evaluate_cards
+from poker_engine import Card, CARD_STRINGS
+from outs_detector import (
+    OutsDetector, OutEntry, DRAW_TYPES, STRAIGHT_MASKS, STRAIGHT_FLUSH_MASKS, ROYAL_MASK,
+    ROYAL_FLUSH, STRAIGHT_FLUSH, FLUSH, STRAIGHT, PAIR,
+    THREE_OF_A_KIND, FOUR_OF_A_KIND, FULL_HOUSE, TWO_PAIR,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Numba version of the find_outs candidate search. Cards are deck indexes
+# (rank_index * 4 + suit_index); the kernel applies the candidate rules listed in
+# OutsDetector._find_outs and returns each candidate once, tagged with its
+# highest-priority draw type.
+try:
+    import numpy as np
+    from numba import njit
+
+    _STRAIGHT_MASKS = np.array(STRAIGHT_MASKS, dtype=np.int64)
+    _STRAIGHT_FLUSH_MASKS = np.array(STRAIGHT_FLUSH_MASKS, dtype=np.int64)
+
+    @njit("int64(int64)", cache=True)
+    def _bit_count(mask):
+        count = 0
+        while mask:
+            mask &= mask - 1
+            count += 1
+        return count
+
+    @njit("int64(int64)", cache=True)
+    def _lowest_bit_index(mask):
+        index = 0
+        while not (mask >> index) & 1:
+            index += 1
+        return index
+
+    @njit("UniTuple(int64[:], 2)(int64[:], int64)", cache=True)
+    def _find_outs_nb(cards, num_hole):
+        """Return (card indexes, draw types) of every candidate out."""
+        num_cards = cards.shape[0]
+        known_mask = 0
+        rank_mask = 0
+        rank_counts = np.zeros(15, dtype=np.int64)
+        board_rank_counts = np.zeros(15, dtype=np.int64)
+        suit_counts = np.zeros(4, dtype=np.int64)
+        suit_rank_masks = np.zeros(4, dtype=np.int64)
+        # Suits in order of first appearance, matching dict iteration order
+        suit_order = np.empty(4, dtype=np.int64)
+        num_suits = 0
+        for i in range(num_cards):
+            card = cards[i]
+            value = card // 4 + 2
+            suit = card % 4
+            known_mask |= 1 << card
+            rank_mask |= 1 << value
+            if suit_counts[suit] == 0:
+                suit_order[num_suits] = suit
+                num_suits += 1
+            suit_counts[suit] += 1
+            suit_rank_masks[suit] |= 1 << value
+            rank_counts[value] += 1
+            if i >= num_hole:
+                board_rank_counts[value] += 1
+
+        out_cards = np.empty(52, dtype=np.int64)
+        out_types = np.empty(52, dtype=np.int64)
+        num_outs = 0
+        seen = known_mask
+
+        # Royal flush, then straight flush draws
+        for i in range(num_suits):
+            suit = suit_order[i]
+            held = suit_rank_masks[suit] & ROYAL_MASK
+            if _bit_count(held) >= 4:
+                missing = ROYAL_MASK & ~held
+                while missing:
+                    value = _lowest_bit_index(missing)
+                    missing &= missing - 1
+                    card = (value - 2) * 4 + suit
+                    if not (seen >> card) & 1:
+                        seen |= 1 << card
+                        out_cards[num_outs] = card
+                        out_types[num_outs] = ROYAL_FLUSH
+                        num_outs += 1
+        for i in range(num_suits):
+            suit = suit_order[i]
+            for j in range(_STRAIGHT_FLUSH_MASKS.shape[0]):
+                missing = _STRAIGHT_FLUSH_MASKS[j] & ~suit_rank_masks[suit]
+                if _bit_count(missing) == 1:
+                    card = (_lowest_bit_index(missing) - 2) * 4 + suit
+                    if not (seen >> card) & 1:
+                        seen |= 1 << card
+                        out_cards[num_outs] = card
+                        out_types[num_outs] = STRAIGHT_FLUSH
+                        num_outs += 1
+
+        # Flush draws and completed flushes
+        has_flush_draw = False
+        for i in range(num_suits):
+            suit = suit_order[i]
+            if suit_counts[suit] == 4:
+                has_flush_draw = True
+            if suit_counts[suit] >= 4:
+                for rank_index in range(13):
+                    card = rank_index * 4 + suit
+                    if not (seen >> card) & 1:
+                        seen |= 1 << card
+                        out_cards[num_outs] = card
+                        out_types[num_outs] = FLUSH
+                        num_outs += 1
+
+        # Straight draws, counting every remaining card of each completing rank
+        completing_ranks = 0
+        for j in range(_STRAIGHT_MASKS.shape[0]):
+            missing = _STRAIGHT_MASKS[j] & ~rank_mask
+            if _bit_count(missing) == 1:
+                completing_ranks |= missing
+        num_straight_outs = 0
+        for value in range(2, 15):
+            if (completing_ranks >> value) & 1:
+                for suit in range(4):
+                    card = (value - 2) * 4 + suit
+                    if not (known_mask >> card) & 1:
+                        num_straight_outs += 1
+                        if not (seen >> card) & 1:
+                            seen |= 1 << card
+                            out_cards[num_outs] = card
+                            out_types[num_outs] = STRAIGHT
+                            num_outs += 1
+
+        # Overcards, unless a flush draw or 4+ straight outs take priority
+        num_board = num_cards - num_hole
+        if num_board > 0 and not has_flush_draw and num_straight_outs < 4:
+            highest_board = 0
+            for i in range(num_hole, num_cards):
+                highest_board = max(highest_board, cards[i] // 4 + 2)
+            for i in range(num_hole):
+                value = cards[i] // 4 + 2
+                if value > highest_board:
+                    for suit in range(4):
+                        card = (value - 2) * 4 + suit
+                        if not (seen >> card) & 1:
+                            seen |= 1 << card
+                            out_cards[num_outs] = card
+                            out_types[num_outs] = PAIR
+                            num_outs += 1
+
+        # Pairs to trips, trips to quads or a full house
+        board_has_pair = False
+        num_pairs = 0
+        for value in range(2, 15):
+            if board_rank_counts[value] >= 2:
+                board_has_pair = True
+            if rank_counts[value] >= 2:
+                num_pairs += 1
+        for value in range(2, 15):
+            count = rank_counts[value]
+            if count == 2 and board_has_pair and board_rank_counts[value] >= 1:
+                continue
+            if count == 2 or count == 3:
+                draw_type = THREE_OF_A_KIND if count == 2 else FOUR_OF_A_KIND
+                for suit in range(4):
+                    card = (value - 2) * 4 + suit
+                    if not (seen >> card) & 1:
+                        seen |= 1 << card
+                        out_cards[num_outs] = card
+                        out_types[num_outs] = draw_type
+                        num_outs += 1
+            if count == 3:
+                for other in range(2, 15):
+                    if other != value and rank_counts[other] == 1:
+                        for suit in range(4):
+                            card = (other - 2) * 4 + suit
+                            if not (seen >> card) & 1:
+                                seen |= 1 << card
+                                out_cards[num_outs] = card
+                                out_types[num_outs] = FULL_HOUSE
+                                num_outs += 1
+
+        # Unpaired hole cards pairing up on a paired board
+        if num_board > 0 and num_pairs < 2 and board_has_pair:
+            for i in range(num_hole):
+                value = cards[i] // 4 + 2
+                if rank_counts[value] >= 2:
+                    continue
+                for suit in range(4):
+                    card = (value - 2) * 4 + suit
+                    if not (seen >> card) & 1:
+                        seen |= 1 << card
+                        out_cards[num_outs] = card
+                        out_types[num_outs] = TWO_PAIR
+                        num_outs += 1
+
+        return out_cards[:num_outs], out_types[:num_outs]
+
+    class OptimizedOutsDetector(OutsDetector):
+        """Outs detector running the candidate search in a Numba kernel."""
+
+        def _find_outs(self, hole_cards: List[Card], community_cards: List[Card]) -> List[OutEntry]:
+            """Find outs like OutsDetector._find_outs, with the candidate search compiled."""
+            known_ids = [card.index for card in hole_cards + community_cards]
+            # Only 5-7 card hands can be evaluated, so nothing else validates as an out
+            if not 4 <= len(known_ids) <= 6:
+                return []
+            
+            out_cards, out_types = _find_outs_nb(np.array(known_ids, dtype=np.int64), len(hole_cards))
+            current_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
+            # Order by draw type priority, then deck order, like OutsDetector._find_outs
+            return [
+                OutEntry(CARD_STRINGS[card], DRAW_TYPES[draw_type])
+                for draw_type, card in sorted(zip(out_types.tolist(), out_cards.tolist()))
+                if evaluate_cards(*known_ids, card) < current_strength
+            ]
+
+except ImportError:
+    logger.warning("Numba not available, using standard outs detector")
+    OptimizedOutsDetector = OutsDetector
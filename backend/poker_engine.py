@@ -1,18 +1,93 @@
 """Core poker engine for hand evaluation and analysis."""
 
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from typing import List, Tuple, Dict, Optional, Union
 from phevaluator import evaluate_cards
+from ckc_eval import best_hand_for_any_hole_cards
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bitmask with one bit set for every card in a 52-card deck
+FULL_DECK_MASK = (1 << 52) - 1
+
+# Card bitmasks of the 13 cards of each suit and of each suit's ace (index = rank_index * 4 + suit_index)
+SUIT_CARD_MASKS = tuple(sum(1 << (rank_index * 4 + suit_index) for rank_index in range(13)) for suit_index in range(4))
+ACE_CARD_MASKS = tuple(1 << (12 * 4 + suit_index) for suit_index in range(4))
+
+# Rank bitmasks (bit n set = card value n present) for A-K-Q-J-10 and A-2-3-4-5
+ROYAL_RANK_MASK = 0b111110000000000
+WHEEL_RANK_MASK = 0b100000000111100
+
+# Best (lowest) phevaluator rank of each hand class, see get_hand_type_from_rank
+BEST_QUADS_RANK = 11
+BEST_FLUSH_RANK = 323
+BEST_STRAIGHT_RANK = 1600
+BEST_TRIPS_RANK = 1610
+
+# Maximum number of distinct hands kept by the hand evaluation cache
+EVALUATE_CACHE_SIZE = 1 << 20
+
+# Maximum number of (board, known cards) nuts searches kept per engine
+BEST_STRENGTH_CACHE_SIZE = 65_536
+
+
+@lru_cache(maxsize=EVALUATE_CACHE_SIZE)
+def _evaluate_card_ids(card_ids: Tuple[int, ...]) -> int:
+    """Evaluate a hand given as a sorted tuple of card indexes (lower = stronger)."""
+    return evaluate_cards(*card_ids)
+
+
+def _most_ranks_in_straight(rank_mask: int) -> int:
+    """Most ranks of rank_mask (bit n = card value n) that fit in a single 5-card straight."""
+    # An ace also plays low in the A-2-3-4-5 wheel
+    if rank_mask & (1 << 14):
+        rank_mask |= 1 << 1
+    return max(((rank_mask >> start) & 0x1F).bit_count() for start in range(1, 11))
+
+
+# There are only 2**13 rank masks, so each one's straight draws are worked out once
+@lru_cache(maxsize=None)
+def _straight_draw_ranks(rank_mask: int) -> Tuple[int, ...]:
+    """Ranks (ascending) that complete a straight with rank_mask (bit n = card value n)."""
+    # An ace also plays low: bit 1 lets the A-2-3-4-5 wheel share the window scan
+    if rank_mask & (1 << 14):
+        rank_mask |= 1 << 1
+    
+    # Check all possible 5-card straights, wheel (A-5) through broadway (10-A);
+    # a window holding 4 of its 5 ranks needs exactly the missing one
+    needed_mask = 0
+    for start in range(1, 11):
+        window = (rank_mask >> start) & 0x1F
+        if window.bit_count() == 4:
+            needed_mask |= (~window & 0x1F) << start
+    
+    # A low ace is still an ace
+    if needed_mask & (1 << 1):
+        needed_mask = (needed_mask & ~(1 << 1)) | (1 << 14)
+    
+    return tuple(value for value in range(2, 15) if needed_mask >> value & 1)
+
+
+def _char_code_table(chars: str, first: int) -> bytes:
+    """Map each ASCII code in chars to first, first + 1, ...; every other code maps to 0."""
+    table = bytearray(128)
+    for offset, char in enumerate(chars):
+        table[ord(char)] = first + offset
+    return bytes(table)
+
 
 class Card:
     """Represents a playing card."""
     
+    __slots__ = ('rank', 'suit', 'value', 'suit_index', 'index', 'mask', '_str')
+    
     RANKS = '23456789TJQKA'
     SUITS = 'shdc'
     RANK_VALUES = {r: i for i, r in enumerate(RANKS, 2)}
+    # Card value and suit index + 1 by character code, 0 for invalid characters
+    _VALUE_BY_CODE = _char_code_table(RANKS, 2)
+    _SUIT_NUMBER_BY_CODE = _char_code_table(SUITS, 1)
     
     def __init__(self, card_str: str):
         """Initialize card from string notation like 'As' or 'Kh'."""
@@ -20,52 +95,113 @@ class Card:
             raise ValueError(f"Invalid card format: {card_str}")
         
         rank, suit = card_str[0], card_str[1]
+        rank_code, suit_code = ord(rank), ord(suit)
         
-        if rank not in self.RANKS:
+        value = self._VALUE_BY_CODE[rank_code] if rank_code < 128 else 0
+        if not value:
             raise ValueError(f"Invalid rank: {rank}")
-        if suit not in self.SUITS:
+        suit_number = self._SUIT_NUMBER_BY_CODE[suit_code] if suit_code < 128 else 0
+        if not suit_number:
             raise ValueError(f"Invalid suit: {suit}")
         
         self.rank = rank
         self.suit = suit
-        self.value = self.RANK_VALUES[rank]
+        self.value = value
+        self.suit_index = suit_number - 1
+        # Position in the standard deck order (rank-major) and its single-bit mask
+        self.index = (value - 2) * len(self.SUITS) + self.suit_index
+        self.mask = 1 << self.index
+        self._str = card_str
     
     def __str__(self) -> str:
-        return f"{self.rank}{self.suit}"
+        return self._str
     
     def __eq__(self, other) -> bool:
-        return isinstance(other, Card) and str(self) == str(other)
+        return isinstance(other, Card) and self.index == other.index
     
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self.index
     
     def __repr__(self) -> str:
         return f"Card('{self}')"
 
 
+# Card string for every deck index (Card.index order)
+CARD_STRINGS = tuple(rank + suit for rank in Card.RANKS for suit in Card.SUITS)
+
+
 class PokerEngine:
     """Core poker engine for hand evaluation and analysis."""
     
     def __init__(self):
         """Initialize poker engine."""
         self.deck = self._create_deck()
+        self._cards_by_str = dict(zip(CARD_STRINGS, self.deck))
+        self._card_masks_by_str = {card_str: card.mask for card_str, card in self._cards_by_str.items()}
+        # Nuts searches depend only on the board and the known cards, which repeat
+        # across sibling NUTS checks and requests
+        self._best_hand_cached = lru_cache(maxsize=BEST_STRENGTH_CACHE_SIZE)(
+            self._best_hand_for_any_hole_cards
+        )
     
     def _create_deck(self) -> List[Card]:
-        """Create a standard 52-card deck."""
-        deck = []
-        for rank in Card.RANKS:
-            for suit in Card.SUITS:
-                deck.append(Card(f"{rank}{suit}"))
-        return deck
+        """Create a standard 52-card deck, in Card.index order."""
+        return [Card(card_str) for card_str in CARD_STRINGS]
     
     def parse_cards(self, card_strings: List[str]) -> List[Card]:
-        """Convert card strings to Card objects."""
-        return [Card(card_str) for card_str in card_strings]
+        """
+        Convert card strings to Card objects.
+        
+        Valid cards are shared instances from the engine's deck, so parsing is a
+        dict lookup; anything else goes through Card() to raise the usual ValueError.
+        """
+        cards_by_str = self._cards_by_str
+        return [
+            cards_by_str[card_str] if card_str in cards_by_str else Card(card_str)
+            for card_str in card_strings
+        ]
+    
+    def parse_cards_to_mask(self, card_strings: List[str]) -> int:
+        """
+        Convert card strings straight to a card mask (see cards_to_mask).
+        
+        Request handlers only need the mask, so this skips building Card objects;
+        invalid cards raise the same ValueError as parse_cards.
+        """
+        card_masks_by_str = self._card_masks_by_str
+        mask = 0
+        for card_str in card_strings:
+            card_mask = card_masks_by_str.get(card_str)
+            if card_mask is None:
+                card_mask = Card(card_str).mask
+            mask |= card_mask
+        return mask
+    
+    def cards_to_mask(self, cards: List[Card]) -> int:
+        """Convert cards to a 52-bit mask with one bit set per card."""
+        mask = 0
+        for card in cards:
+            mask |= card.mask
+        return mask
+    
+    def mask_to_cards(self, mask: int) -> List[Card]:
+        """Convert a 52-bit card mask back to Card objects in deck order."""
+        cards = []
+        while mask:
+            lowest_bit = mask & -mask
+            cards.append(self.deck[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return cards
     
-    def get_remaining_deck(self, known_cards: List[Card]) -> List[Card]:
-        """Get remaining cards in deck excluding known cards."""
-        known_set = set(str(card) for card in known_cards)
-        return [card for card in self.deck if str(card) not in known_set]
+    def get_remaining_deck(self, known_cards: Union[List[Card], int]) -> List[Card]:
+        """
+        Get remaining cards in deck excluding known cards.
+        
+        Known cards may be passed as a list or as a card mask (see cards_to_mask),
+        so callers filtering the deck repeatedly can build the mask once.
+        """
+        known_mask = known_cards if isinstance(known_cards, int) else self.cards_to_mask(known_cards)
+        return [card for card in self.deck if not card.mask & known_mask]
     
     def evaluate_hand_strength(self, hole_cards: List[Card], community_cards: List[Card]) -> int:
         """
@@ -73,19 +209,24 @@ class PokerEngine:
         Lower numbers = stronger hands.
         """
         try:
-            # Convert to phevaluator format
-            all_cards = [str(card) for card in hole_cards + community_cards]
+            # phevaluator's integer API takes ids laid out like Card.index
+            # (rank * 4 + suit; only the suit order differs, which can't change
+            # a rank), so no card strings are built or parsed per evaluation
+            all_cards = [card.index for card in hole_cards]
+            all_cards.extend(card.index for card in community_cards)
             
             if len(all_cards) < 5:
                 # Not enough cards for evaluation
                 return 9999
             
-            # Use phevaluator to get hand strength
-            hand_rank = evaluate_cards(*all_cards)
+            # Sorted ids so every ordering of the same hand shares a cache entry
+            all_cards.sort()
+            hand_rank = _evaluate_card_ids(tuple(all_cards))
             return hand_rank
             
         except Exception as e:
-            logger.error(f"Error evaluating hand: {e}")
+            hand = ' '.join(str(card) for card in hole_cards + community_cards)
+            logger.error(f"Error evaluating hand {hand}: {e}")
             return 9999
     
     def get_hand_type_from_rank(self, rank: int) -> str:
@@ -111,54 +252,26 @@ class PokerEngine:
     
     def is_flush_draw(self, hole_cards: List[Card], community_cards: List[Card]) -> Tuple[bool, str]:
         """Check if there's a flush draw and return the suit."""
-        suit_counts = {}
-        all_cards = hole_cards + community_cards
-        
-        for card in all_cards:
-            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
+        suit_rank_masks = self.get_suit_rank_masks(hole_cards + community_cards)
         
         # Need 4 cards of same suit for flush draw
-        for suit, count in suit_counts.items():
-            if count == 4:
-                return True, suit
+        for suit_index, suit_mask in enumerate(suit_rank_masks):
+            if suit_mask.bit_count() == 4:
+                return True, Card.SUITS[suit_index]
         
         return False, ""
     
     def is_straight_draw(self, hole_cards: List[Card], community_cards: List[Card]) -> Tuple[bool, List[int]]:
         """
         Check for straight draws and return the ranks needed.
-        Returns (has_draw, needed_ranks).
+        Returns (has_draw, needed_ranks), needed_ranks in ascending order.
         """
-        all_cards = hole_cards + community_cards
-        ranks = sorted(set(card.value for card in all_cards))
-        
-        # Check for open-ended straight draws
-        needed_ranks = []
-        
-        # Check all possible 5-card straights
-        for start in range(2, 11):  # 2 to 10 (A-5 straight starts at 1)
-            straight_ranks = list(range(start, start + 5))
-            missing = [r for r in straight_ranks if r not in ranks]
-            
-            if len(missing) == 1:  # Need exactly 1 card for straight
-                needed_ranks.extend(missing)
-        
-        # Special case for A-5 straight (wheel)
-        wheel_ranks = [14, 2, 3, 4, 5]  # A, 2, 3, 4, 5
-        missing_wheel = [r for r in wheel_ranks if r not in ranks]
-        if len(missing_wheel) == 1:
-            needed_ranks.extend(missing_wheel)
-        
-        # Check for open-ended draws (need 2 cards on ends)
-        for start in range(2, 10):
-            straight_ranks = list(range(start, start + 5))
-            missing = [r for r in straight_ranks if r not in ranks]
-            
-            if len(missing) == 2 and missing == [start - 1, start + 4]:
-                # Open-ended draw
-                needed_ranks.extend(missing)
+        rank_mask = 0
+        for card in hole_cards + community_cards:
+            rank_mask |= 1 << card.value
         
-        return len(needed_ranks) > 0, list(set(needed_ranks))
+        needed_ranks = _straight_draw_ranks(rank_mask)
+        return len(needed_ranks) > 0, list(needed_ranks)
     
     def count_rank_occurrences(self, cards: List[Card]) -> Dict[int, int]:
         """Count occurrences of each rank."""
@@ -167,16 +280,37 @@ class PokerEngine:
             rank_counts[card.value] = rank_counts.get(card.value, 0) + 1
         return rank_counts
     
+    def count_rank_occurrences_array(self, cards: List[Card]) -> bytearray:
+        """Count occurrences of each rank in a 15-slot array indexed by card value (2-14)."""
+        rank_counts = bytearray(15)
+        for card in cards:
+            rank_counts[card.value] += 1
+        return rank_counts
+    
+    def get_suit_rank_masks(self, cards: List[Card]) -> List[int]:
+        """Get a rank bitmask (bit n set = card value n held) per suit, indexed by Card.suit_index."""
+        suit_rank_masks = [0] * len(Card.SUITS)
+        for card in cards:
+            suit_rank_masks[card.suit_index] |= 1 << card.value
+        return suit_rank_masks
+    
+    def count_suit_occurrences_array(self, cards: List[Card]) -> bytearray:
+        """Count occurrences of each suit in a 4-slot array indexed by Card.suit_index."""
+        suit_counts = bytearray(len(Card.SUITS))
+        for card in cards:
+            suit_counts[card.suit_index] += 1
+        return suit_counts
+    
     def get_pairs_and_sets(self, hole_cards: List[Card], community_cards: List[Card]) -> Dict[str, List[int]]:
-        """Get information about pairs, trips, and quads."""
+        """Get information about pairs, trips, and quads (each list in ascending rank order)."""
         all_cards = hole_cards + community_cards
-        rank_counts = self.count_rank_occurrences(all_cards)
+        rank_counts = self.count_rank_occurrences_array(all_cards)
         
         pairs = []
         trips = []
         quads = []
         
-        for rank, count in rank_counts.items():
+        for rank, count in enumerate(rank_counts):
             if count == 2:
                 pairs.append(rank)
             elif count == 3:
@@ -192,24 +326,12 @@ class PokerEngine:
     
     def has_royal_flush_draw(self, hole_cards: List[Card], community_cards: List[Card]) -> Tuple[bool, str]:
         """Check for royal flush draw (need A, K, Q, J, 10 of same suit)."""
-        suit_cards = {}
-        all_cards = hole_cards + community_cards
-        
-        # Group cards by suit
-        for card in all_cards:
-            if card.suit not in suit_cards:
-                suit_cards[card.suit] = []
-            suit_cards[card.suit].append(card.value)
+        suit_rank_masks = self.get_suit_rank_masks(hole_cards + community_cards)
         
-        # Check each suit for royal flush potential
-        royal_ranks = {14, 13, 12, 11, 10}  # A, K, Q, J, 10
-        
-        for suit, ranks in suit_cards.items():
-            if len(ranks) >= 4:  # Need at least 4 cards of same suit
-                suit_ranks = set(ranks)
-                missing = royal_ranks - suit_ranks
-                if len(missing) <= 1:  # Missing 0 or 1 card for royal
-                    return True, suit
+        # Holding 4 or 5 of the royal cards in one suit: missing 0 or 1 card for royal
+        for suit_index, suit_mask in enumerate(suit_rank_masks):
+            if (suit_mask & ROYAL_RANK_MASK).bit_count() >= 4:
+                return True, Card.SUITS[suit_index]
         
         return False, ""
     
@@ -243,13 +365,17 @@ class PokerEngine:
             player_hand_strength = self.evaluate_hand_strength(hole_cards, community_cards)
             
             # Check if the player's hand uses at least one hole card
-            if not self._uses_at_least_one_hole_card(hole_cards, community_cards):
+            if not self._uses_at_least_one_hole_card(hole_cards, community_cards, player_hand_strength):
                 return False
                 
+            # Skip the search when no hand could beat the player on this board
+            if player_hand_strength <= self._board_rank_lower_bound(community_cards):
+                return True
+            
             # Find the absolute best possible hand given the board
             # Use the fixed version that excludes already known cards
-            all_known_cards = hole_cards + community_cards
-            best_possible_strength = self._find_best_possible_hand_strength_excluding_known(community_cards, all_known_cards)
+            known_mask = self.cards_to_mask(hole_cards) | self.cards_to_mask(community_cards)
+            best_possible_strength = self._find_best_possible_hand_strength_excluding_known(community_cards, known_mask)
             
             # Return true if player's hand is the best possible hand (or tied for best)
             # In phevaluator, lower numbers are better, so nuts means player_strength <= best_possible
@@ -272,18 +398,48 @@ class PokerEngine:
         player_hand_strength = self.evaluate_hand_strength(hole_cards, completed_board)
         
         # Check if the player's hand uses at least one hole card (not just playing the board)
-        if not self._uses_at_least_one_hole_card(hole_cards, completed_board):
+        if not self._uses_at_least_one_hole_card(hole_cards, completed_board, player_hand_strength):
             return False
             
+        # Skip the search when no hand could beat the player on this board
+        if player_hand_strength <= self._board_rank_lower_bound(completed_board):
+            return True
+        
         # Find the absolute best possible hand given the completed board
         # Use the fixed version that excludes already known cards
-        all_known_for_completed = hole_cards + completed_board
-        best_possible_strength = self._find_best_possible_hand_strength_excluding_known(completed_board, all_known_for_completed)
+        known_mask = self.cards_to_mask(hole_cards) | self.cards_to_mask(completed_board)
+        best_possible_strength = self._find_best_possible_hand_strength_excluding_known(completed_board, known_mask)
         
         # Return true if player's hand is the best possible hand (or tied for best)
         # In phevaluator, lower numbers are better, so nuts means player_strength <= best_possible
         return player_hand_strength <= best_possible_strength
     
+    def _board_rank_lower_bound(self, board: List[Card]) -> int:
+        """
+        Get a rank no two hole cards can beat on this board (lower = stronger).
+        
+        Board texture rules out whole hand classes: quads and full houses need a
+        paired board, flushes three suited board cards, straights three board ranks
+        within one straight. Returns 0 (no bound) when a straight flush is possible.
+        """
+        if len(board) < 3:
+            return 0
+        
+        rank_mask = 0
+        for card in board:
+            rank_mask |= 1 << card.value
+        
+        # Three board cards of a suit within one straight: a straight flush is possible
+        if any(_most_ranks_in_straight(suit_mask) >= 3 for suit_mask in self.get_suit_rank_masks(board)):
+            return 0
+        if rank_mask.bit_count() < len(board):  # Paired board
+            return BEST_QUADS_RANK
+        if max(self.count_suit_occurrences_array(board)) >= 3:
+            return BEST_FLUSH_RANK
+        if _most_ranks_in_straight(rank_mask) >= 3:
+            return BEST_STRAIGHT_RANK
+        return BEST_TRIPS_RANK
+    
     def _uses_both_hole_cards(self, hole_cards: List[Card], board: List[Card]) -> bool:
         """
         Check if the best 5-card hand uses both hole cards (not just playing the board).
@@ -300,18 +456,18 @@ class PokerEngine:
         # For boards with 5+ cards, we need to determine if both hole cards
         # are part of the best 5-card hand
         if len(board) >= 5:
-            all_cards = hole_cards + board
+            known_mask = self.cards_to_mask(hole_cards) | self.cards_to_mask(board)
             player_strength = self.evaluate_hand_strength(hole_cards, board)
             
+            # The dummy card is the first card left in deck order: the lowest unknown bit
+            unknown_mask = FULL_DECK_MASK & ~known_mask
+            dummy_card = self.deck[(unknown_mask & -unknown_mask).bit_length() - 1] if unknown_mask else None
+            
             # Test what happens if we use only one hole card
-            for i, hole_card in enumerate(hole_cards):
-                other_hole_card = hole_cards[1-i]
-                
+            for hole_card in hole_cards:
                 # Find the best possible hand using only one hole card and the board
-                remaining = self.get_remaining_deck(all_cards)
-                if remaining:
+                if dummy_card is not None:
                     # Try with a dummy card instead of the second hole card
-                    dummy_card = remaining[0]  # Use first available card as dummy
                     single_hole_strength = self.evaluate_hand_strength([hole_card, dummy_card], board)
                     
                     # If using only one hole card gives the same strength,
@@ -321,24 +477,21 @@ class PokerEngine:
             
             # Test if board-only hand (5 cards from board) is as good
             if len(board) == 5:
-                # Create dummy hole cards that won't interfere
-                remaining = self.get_remaining_deck(all_cards)
-                if len(remaining) >= 2:
-                    dummy_cards = remaining[:2]
-                    board_only_strength = self.evaluate_hand_strength(dummy_cards, board)
-                    
-                    # If board-only is as good or better, hole cards aren't both used
-                    if board_only_strength <= player_strength:
-                        return False
+                board_only_strength = self.evaluate_hand_strength([], board)
+                
+                # If board-only is as good or better, hole cards aren't both used
+                if board_only_strength <= player_strength:
+                    return False
         
         return True
     
-    def _uses_at_least_one_hole_card(self, hole_cards: List[Card], board: List[Card]) -> bool:
+    def _uses_at_least_one_hole_card(self, hole_cards: List[Card], board: List[Card], player_strength: Optional[int] = None) -> bool:
         """
         Check if the best 5-card hand uses at least one hole card (not just playing the board).
         
         A hand "uses at least one hole card" if one or both hole cards are part of the best 5-card combination.
-        This is less restrictive than requiring both hole cards.
+        This is less restrictive than requiring both hole cards. Callers that already
+        evaluated the hand can pass player_strength to skip re-evaluating it.
         """
         if len(hole_cards) != 2:
             return False
@@ -350,20 +503,17 @@ class PokerEngine:
         # For boards with 5+ cards, we need to determine if at least one hole card
         # is part of the best 5-card hand
         if len(board) >= 5:
-            all_cards = hole_cards + board
-            player_strength = self.evaluate_hand_strength(hole_cards, board)
+            if player_strength is None:
+                player_strength = self.evaluate_hand_strength(hole_cards, board)
             
-            # Test if board-only hand (5 cards from board) is as good
+            # Test if board-only hand (5 cards from board) is as good; the board
+            # is ranked directly, since dummy hole cards could pair it
             if len(board) == 5:
-                # Create dummy hole cards that won't interfere
-                remaining = self.get_remaining_deck(all_cards)
-                if len(remaining) >= 2:
-                    dummy_cards = remaining[:2]
-                    board_only_strength = self.evaluate_hand_strength(dummy_cards, board)
-                    
-                    # If board-only is as good or better, no hole cards are used
-                    if board_only_strength <= player_strength:
-                        return False
+                board_only_strength = self.evaluate_hand_strength([], board)
+                
+                # If board-only is as good or better, no hole cards are used
+                if board_only_strength <= player_strength:
+                    return False
             
             # If we reach here, at least one hole card is being used
             return True
@@ -378,7 +528,6 @@ class PokerEngine:
         Fixed to handle 5-card boards properly without creating 8-card hands.
         """
         best_strength = 9999  # Worst possible hand
-        remaining_deck = self.get_remaining_deck(board)
         
         # Ensure we don't have too many cards
         if len(board) > 5:
@@ -386,21 +535,36 @@ class PokerEngine:
             return best_strength
         
         # Try all possible 2-card combinations from remaining deck
-        for i in range(len(remaining_deck)):
-            for j in range(i + 1, len(remaining_deck)):
-                test_hole_cards = [remaining_deck[i], remaining_deck[j]]
-                # This ensures we have at most 2 + 5 = 7 cards for evaluation
-                try:
-                    hand_strength = self.evaluate_hand_strength(test_hole_cards, board)
-                    
-                    # Lower number = better hand
-                    if hand_strength < best_strength:
-                        best_strength = hand_strength
-                except Exception as e:
-                    # Skip invalid combinations and continue
-                    continue
-        
-        return best_strength
+        board_mask = self.cards_to_mask(board)
+        return self._best_hand_cached(board_mask, board_mask)[0]
+    
+    def _best_hand_for_any_hole_cards(self, board_mask: int, known_mask: int) -> Tuple[int, Tuple[int, int]]:
+        """
+        Find the best hand strength any two cards outside known_mask make with the
+        board, with the card indexes of a pair making it ((-1, -1) if the board does).
+        
+        Called through the per-engine _best_hand_cached memo. The pair
+        evaluations run inside ckc_eval's compiled evaluator rather than as one
+        Python -> phevaluator call each.
+        
+        Only pairs that can rank differently are searched. A suit with fewer than
+        three board cards can never make a flush, so its cards only matter by rank,
+        and two hole cards use at most two cards of a rank: keeping two such cards
+        per rank (plus every card of a flush-capable suit) covers every distinct
+        hand, typically cutting ~1000 pairs to ~300-600.
+        """
+        board = self.mask_to_cards(board_mask)
+        board_suit_counts = self.count_suit_occurrences_array(board)
+        rank_copies = bytearray(15)
+        candidate_ids = []
+        for card in self.get_remaining_deck(known_mask):
+            if board_suit_counts[card.suit_index] >= 3:
+                candidate_ids.append(card.index)
+            elif rank_copies[card.value] < 2:
+                rank_copies[card.value] += 1
+                candidate_ids.append(card.index)
+        
+        return best_hand_for_any_hole_cards([card.index for card in board], candidate_ids)
     
     def _is_flush_nuts_scenario(self, hole_cards: List[Card], completed_board: List[Card], completing_card: Card) -> bool:
         """
@@ -411,56 +575,50 @@ class PokerEngine:
         2. There are no pairs on the board (no full house/quads possible)
         3. No straight flush is possible
         """
-        all_cards = hole_cards + completed_board
+        # One pass builds each suit's rank bitmask and spots repeated board ranks
+        suit_rank_masks = [0, 0, 0, 0]
+        for card in hole_cards:
+            suit_rank_masks[card.suit_index] |= 1 << card.value
+        board_rank_mask = 0
+        board_has_pairs = False
+        for card in completed_board:
+            rank_bit = 1 << card.value
+            suit_rank_masks[card.suit_index] |= rank_bit
+            if board_rank_mask & rank_bit:
+                board_has_pairs = True
+            board_rank_mask |= rank_bit
         
         # Check if we have a flush
-        suit_counts = {}
-        for card in all_cards:
-            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
-        
-        flush_suit = None
-        for suit, count in suit_counts.items():
-            if count >= 5:
-                flush_suit = suit
+        flush_mask = 0
+        for suit_mask in suit_rank_masks:
+            if suit_mask.bit_count() >= 5:
+                flush_mask = suit_mask
                 break
         
-        if not flush_suit:
+        if not flush_mask:
             return False
         
         # Check if board has pairs (full house/quads possible)
-        board_rank_counts = self.count_rank_occurrences(completed_board)
-        board_has_pairs = any(count >= 2 for count in board_rank_counts.values())
-        
         if board_has_pairs:
             return False  # Full house/quads possible, not a simple flush scenario
         
-        # Check for straight flush possibility
-        flush_cards = [card for card in all_cards if card.suit == flush_suit]
-        flush_ranks = sorted([card.value for card in flush_cards])
-        
-        # Simple check for straight flush - if 5 consecutive ranks in flush suit
-        if self._has_straight_flush_potential(flush_ranks):
+        # Check for straight flush possibility - 5 consecutive ranks in flush suit
+        if self._has_straight_flush_potential(flush_mask):
             return False  # Straight flush possible, use general evaluation
         
         return True
     
-    def _has_straight_flush_potential(self, flush_ranks: List[int]) -> bool:
+    def _has_straight_flush_potential(self, flush_rank_mask: int) -> bool:
         """
-        Check if the flush ranks have straight flush potential.
+        Check if the flush suit's rank bitmask (see get_suit_rank_masks) holds a straight.
         """
-        if len(flush_ranks) < 5:
-            return False
-        
-        # Check for consecutive sequences of 5 or more
-        for i in range(len(flush_ranks) - 4):
-            if flush_ranks[i+4] - flush_ranks[i] == 4:
-                return True
-        
-        # Check for wheel straight flush (A,2,3,4,5)
-        if 14 in flush_ranks and 2 in flush_ranks and 3 in flush_ranks and 4 in flush_ranks and 5 in flush_ranks:
+        # A run of 5 consecutive rank bits survives ANDing 5 shifted copies
+        mask = flush_rank_mask
+        if mask & (mask >> 1) & (mask >> 2) & (mask >> 3) & (mask >> 4):
             return True
         
-        return False
+        # Check for wheel straight flush (A,2,3,4,5)
+        return mask & WHEEL_RANK_MASK == WHEEL_RANK_MASK
     
     def _check_flush_nuts(self, hole_cards: List[Card], completed_board: List[Card], completing_card: Card) -> bool:
         """
@@ -470,86 +628,62 @@ class PokerEngine:
         1. The completed flush must be ace-high (Ace either in hole cards or completing card)
         2. At least one hole card must contribute to the flush (not board-only)
         """
-        all_cards = hole_cards + completed_board
+        hole_mask = self.cards_to_mask(hole_cards)
+        board_mask = self.cards_to_mask(completed_board)
         
         # Find the flush suit
-        suit_counts = {}
-        for card in all_cards:
-            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
-        
-        flush_suit = None
-        for suit, count in suit_counts.items():
-            if count >= 5:
-                flush_suit = suit
+        for suit_index, suit_cards in enumerate(SUIT_CARD_MASKS):
+            if ((hole_mask | board_mask) & suit_cards).bit_count() >= 5:
                 break
-        
-        if not flush_suit:
+        else:
             return False
         
         # Check if the flush is ace-high (ace can be in hole cards OR the completing card)
-        player_has_ace_of_suit = any(
-            card.rank == 'A' and card.suit == flush_suit 
-            for card in hole_cards
-        )
-        
-        completing_card_is_ace = (
-            completing_card.rank == 'A' and completing_card.suit == flush_suit
-        )
-        
-        if not (player_has_ace_of_suit or completing_card_is_ace):
+        ace_mask = ACE_CARD_MASKS[suit_index]
+        if not (hole_mask | completing_card.mask) & ace_mask:
             return False
         
         # Check if at least one hole card contributes to the flush
-        hole_cards_in_flush = [
-            card for card in hole_cards 
-            if card.suit == flush_suit
-        ]
-        
-        if len(hole_cards_in_flush) == 0:
+        if not hole_mask & suit_cards:
             return False  # No hole cards contribute to flush
         
         # Special case: if board (excluding completing card) already has 4 cards of flush suit,
         # and completing card makes 5th, then hole cards must be meaningful
-        original_board_flush_cards = [
-            card for card in completed_board 
-            if card.suit == flush_suit and card != completing_card
-        ]
+        original_board_flush_cards = (board_mask & ~completing_card.mask & suit_cards).bit_count()
         
         # If original board + completing card = 5 flush cards, this is board-only
-        if len(original_board_flush_cards) + (1 if completing_card.suit == flush_suit else 0) >= 5:
+        if original_board_flush_cards + (1 if completing_card.mask & suit_cards else 0) >= 5:
             return False  # Board-only flush
         
         # If we get here, player has ace-high flush with meaningful hole card contribution
         return True
     
-    def _find_best_possible_hand_strength_excluding_known(self, board: List[Card], all_known_cards: List[Card]) -> int:
+    def _find_best_possible_hand_strength_excluding_known(self, board: List[Card], all_known_cards: Union[List[Card], int]) -> int:
         """
         Find the best possible 5-card hand strength given the board, excluding all known cards.
         
         This properly excludes both hole cards and community cards from the remaining deck.
         Used for river NUTS detection where we need to check if anyone else could have a better hand.
+        Known cards may be passed as a list or as a card mask, like get_remaining_deck.
         """
         best_strength = 9999  # Worst possible hand
-        remaining_deck = self.get_remaining_deck(all_known_cards)
         
         # Ensure we don't have too many cards
         if len(board) > 5:
             logger.error(f"Board has too many cards: {len(board)}")
             return best_strength
         
+        board_mask = self.cards_to_mask(board)
+        known_mask = all_known_cards if isinstance(all_known_cards, int) else self.cards_to_mask(all_known_cards)
+        
+        # The nuts for the board alone are shared by every hand on it; they stand
+        # unless the other known cards (e.g. the player's hole cards) block the pair
+        # making them
+        if known_mask & board_mask == board_mask:
+            best_strength, best_pair = self._best_hand_cached(board_mask, board_mask)
+            blocked = any(card_id >= 0 and known_mask >> card_id & 1 for card_id in best_pair)
+            if not blocked:
+                return best_strength
+        
         # Try all possible 2-card combinations from remaining deck
-        for i in range(len(remaining_deck)):
-            for j in range(i + 1, len(remaining_deck)):
-                test_hole_cards = [remaining_deck[i], remaining_deck[j]]
-                # This ensures we have at most 2 + 5 = 7 cards for evaluation
-                try:
-                    hand_strength = self.evaluate_hand_strength(test_hole_cards, board)
-                    
-                    # Lower number = better hand
-                    if hand_strength < best_strength:
-                        best_strength = hand_strength
-                except Exception as e:
-                    # Skip invalid combinations and continue
-                    continue
-        
-        return best_strength
\ No newline at end of file
+        return self._best_hand_cached(board_mask, known_mask)[0]
\ No newline at end of file
@@ -1,25 +1,105 @@
 """Pot odds calculator with precise probability formulas."""
 
-from typing import List, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
 from poker_engine import PokerEngine, Card
-from outs_detector import OutsDetector
+from outs_detector import OutsDetector, OutEntry
+from outs_detector_numba import OptimizedOutsDetector
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Distinct (hole, board) hands whose nuts check result each calculator keeps memoized
+NUTS_CACHE_SIZE = 200_000
+
+
+def _flop_probability(num_outs: int) -> float:
+    """1 - [(47-outs)/47] × [(46-outs)/46], for 0 < outs < 47."""
+    miss_turn = (47 - num_outs) / 47
+    miss_river = (46 - num_outs) / 46
+    miss_both = miss_turn * miss_river
+    return 1 - miss_both
+
+
+# Win probability by number of outs, up to the point where every unseen card is an out
+FLOP_PROBABILITIES = (0.0,) + tuple(_flop_probability(n) for n in range(1, 47)) + (1.0,)
+TURN_PROBABILITIES = (0.0,) + tuple(n / 46 for n in range(1, 46)) + (1.0,)
+
+
+def _format_pot_odds_ratio(win_probability: float) -> str:
+    """
+    Format pot odds ratio as X.X:1, rounded to first decimal.
+    If decimal is .0, show as integer (e.g., 4:1 instead of 4.0:1).
+    """
+    if win_probability <= 0:
+        return "999.0:1"
+    if win_probability >= 1:
+        return "0.0:1"
+    
+    lose_probability = 1 - win_probability
+    ratio = lose_probability / win_probability
+    
+    # Round to 1 decimal place
+    ratio_rounded = round(ratio, 1)
+    
+    # Format as string
+    if ratio_rounded == int(ratio_rounded):
+        return f"{int(ratio_rounded)}:1"
+    else:
+        return f"{ratio_rounded}:1"
+
+
+# Pot odds ratio strings by number of outs, so responses skip the float formatting
+FLOP_POT_ODDS_RATIOS = tuple(_format_pot_odds_ratio(p) for p in FLOP_PROBABILITIES)
+TURN_POT_ODDS_RATIOS = tuple(_format_pot_odds_ratio(p) for p in TURN_PROBABILITIES)
+
+
+def _odds_example(probabilities: Tuple[float, ...], num_outs: int, expected: str) -> Mapping[str, object]:
+    """Build one specification example from a probability table."""
+    probability = probabilities[num_outs]
+    return MappingProxyType({
+        'probability': probability,
+        'ratio': _format_pot_odds_ratio(probability),
+        'expected': expected
+    })
+
+
+# Exact odds for the examples from specifications, used for verification and testing
+EXACT_ODDS_EXAMPLES = MappingProxyType({
+    '4_outs_flop': _odds_example(FLOP_PROBABILITIES, 4, '5.1:1'),
+    '4_outs_turn': _odds_example(TURN_PROBABILITIES, 4, '10.5:1'),
+    '6_outs_flop': _odds_example(FLOP_PROBABILITIES, 6, '3.1:1'),
+    '8_outs_flop': _odds_example(FLOP_PROBABILITIES, 8, '2.2:1'),
+    '9_outs_flop': _odds_example(FLOP_PROBABILITIES, 9, '1.9:1'),
+    '15_outs_flop': _odds_example(FLOP_PROBABILITIES, 15, '0.85:1'),
+})
+
 
 class PotOddsCalculator:
     """Calculate pot odds with precise probability formulas."""
     
+    __slots__ = ('engine', 'outs_detector', '_river_nuts_cached', '_completed_nuts_cached')
+    
     def __init__(self, poker_engine: PokerEngine):
         """Initialize with poker engine."""
         self.engine = poker_engine
         self.outs_detector = OutsDetector(poker_engine)
+        self._river_nuts_cached = lru_cache(maxsize=NUTS_CACHE_SIZE)(self._river_nuts_for_masks)
+        self._completed_nuts_cached = lru_cache(maxsize=NUTS_CACHE_SIZE)(self._completed_nuts_for_masks)
     
     def calculate_pot_odds(self, hole_cards: List[Card], community_cards: List[Card]) -> Tuple[str, List[dict]]:
         """
         Calculate pot odds ratio and find outs.
         Returns (pot_odds_ratio, outs_list).
+        """
+        pot_odds_ratio, outs = self.calculate_pot_odds_entries(hole_cards, community_cards)
+        return pot_odds_ratio, [{'card': card, 'draw_type': draw_type} for card, draw_type in outs]
+    
+    def calculate_pot_odds_entries(self, hole_cards: List[Card], community_cards: List[Card]) -> Tuple[str, Tuple[OutEntry, ...]]:
+        """
+        Calculate pot odds like calculate_pot_odds, with the outs as the detector's
+        cached tuple of OutEntry instead of a list of dicts.
         
         Special case: If completing a five-card draw results in the absolute nuts 
         and uses both hole cards, returns "NUTS!" as pot_odds_ratio.
@@ -28,45 +108,40 @@ class PotOddsCalculator:
         cards_seen = len(hole_cards) + len(community_cards)
         
         # Check for NUTS scenario BEFORE outs detection
-        nuts_detected = False
-        
         if cards_seen == 7:  # River - check current completed hand
-            nuts_detected = self._check_for_river_nuts(hole_cards, community_cards)
             # On the river, there are no more cards to come, so no outs
-            if nuts_detected:
-                return "NUTS!", []
-            else:
-                return "999.0:1", []
-        elif cards_seen >= 5:  # No outs but 5+ cards - check if current hand is already nuts
-            # This handles cases like a completed royal flush on the flop
-            nuts_detected = self._check_for_completed_nuts(hole_cards, community_cards)
-            if nuts_detected:
-                # If current hand is already nuts, don't look for outs
-                return "NUTS!", []
+            return ("NUTS!" if self._check_for_river_nuts(hole_cards, community_cards) else "999.0:1"), ()
+        
+        # With 5+ cards the current hand may already be nuts (e.g. a completed royal
+        # flush on the flop), so don't look for outs. Fewer cards can't make a hand yet.
+        if cards_seen >= 5 and self._check_for_completed_nuts(hole_cards, community_cards):
+            return "NUTS!", ()
         
         # Find all outs (only when not on river)
-        outs = self.outs_detector.find_outs(hole_cards, community_cards)
+        outs = self.outs_detector.find_out_entries(hole_cards, community_cards)
         
         if not outs:
-            return "999.0:1", []
+            return "999.0:1", ()
         
-        num_outs = len(outs)
-        
-        # Calculate win probability based on game phase
-        if cards_seen == 5:  # Flop (2 cards to come)
-            win_probability = self._calculate_flop_probability(num_outs)
-        elif cards_seen == 6:  # Turn (1 card to come)
-            win_probability = self._calculate_turn_probability(num_outs)
-        else:
-            # Pre-flop or other situations - use flop calculation as default
-            win_probability = self._calculate_flop_probability(num_outs)
+        # Turn (1 card to come) or flop (2 cards to come); flop is also the default
+        # for pre-flop or other situations
+        ratios = TURN_POT_ODDS_RATIOS if cards_seen == 6 else FLOP_POT_ODDS_RATIOS
+        return ratios[min(len(outs), len(ratios) - 1)], outs
+    
+    def calculate_pot_odds_mask(self, hole_mask: int, community_mask: int) -> Tuple[str, Tuple[OutEntry, ...]]:
+        """
+        Calculate pot odds like calculate_pot_odds_entries, for hands given as
+        52-bit card masks.
         
-        # Calculate pot odds ratio
-        pot_odds_ratio = self._format_pot_odds_ratio(win_probability)
+        Masks are order-independent, so they double as canonical hand keys for callers
+        that cache results. Overlapping masks mean a card was used twice.
+        """
+        if hole_mask & community_mask:
+            raise ValueError("Duplicate cards found across hole cards and community cards")
         
-        return pot_odds_ratio, outs
-    
-    
+        hole_cards = self.engine.mask_to_cards(hole_mask)
+        community_cards = self.engine.mask_to_cards(community_mask)
+        return self.calculate_pot_odds_entries(hole_cards, community_cards)
     
     def _check_for_river_nuts(self, hole_cards: List[Card], community_cards: List[Card]) -> bool:
         """
@@ -74,31 +149,39 @@ class PotOddsCalculator:
         
         This is used when all 7 cards are known and no outs exist.
         Returns True if the current 5-card hand is the best possible and uses at least one hole card.
+        
+        Results are memoized by the (hole, board) card masks, so repeated hands skip
+        the nuts search entirely.
         """
-        try:
-            # Must have exactly 2 hole cards and 5 community cards
-            if len(hole_cards) != 2 or len(community_cards) != 5:
-                return False
-            
-            # Evaluate the player's best 5-card hand
-            player_hand_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
-            
-            # Check if the player's hand uses at least one hole card
-            if not self.engine._uses_at_least_one_hole_card(hole_cards, community_cards):
-                return False
-            
-            # Find the absolute best possible hand given the board
-            # Pass all known cards (hole + community) to exclude them from remaining deck
-            all_known_cards = hole_cards + community_cards
-            best_possible_strength = self.engine._find_best_possible_hand_strength_excluding_known(community_cards, all_known_cards)
-            
-            # Return true if player's hand is the best possible hand (or tied for best)
-            # In phevaluator, lower numbers are better, so nuts means player_strength <= best_possible
-            return player_hand_strength <= best_possible_strength
-            
-        except Exception as e:
-            logger.warning(f"Error checking river nuts: {e}")
+        return self._river_nuts_cached(
+            self.engine.cards_to_mask(hole_cards), self.engine.cards_to_mask(community_cards)
+        )
+    
+    def _river_nuts_for_masks(self, hole_mask: int, community_mask: int) -> bool:
+        """Check for river nuts with the hand given as card masks."""
+        hole_cards = self.engine.mask_to_cards(hole_mask)
+        community_cards = self.engine.mask_to_cards(community_mask)
+        
+        # Must have exactly 2 hole cards and 5 community cards
+        if len(hole_cards) != 2 or len(community_cards) != 5:
+            return False
+        
+        # Evaluate the player's best 5-card hand
+        player_hand_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
+        
+        # Check if the player's hand uses at least one hole card
+        if not self.engine._uses_at_least_one_hole_card(hole_cards, community_cards, player_hand_strength):
             return False
+        
+        # Find the absolute best possible hand given the board
+        # Pass all known cards (hole + community) to exclude them from remaining deck
+        best_possible_strength = self.engine._find_best_possible_hand_strength_excluding_known(
+            community_cards, hole_mask | community_mask
+        )
+        
+        # Return true if player's hand is the best possible hand (or tied for best)
+        # In phevaluator, lower numbers are better, so nuts means player_strength <= best_possible
+        return player_hand_strength <= best_possible_strength
     
     def _check_for_completed_nuts(self, hole_cards: List[Card], community_cards: List[Card]) -> bool:
         """
@@ -107,40 +190,48 @@ class PotOddsCalculator:
         This is used when we have 5+ cards total and no outs, but the hand might already be nuts.
         For example, a completed royal flush on the flop.
         Returns True if the current 5-card hand is the best possible and uses at least one hole card.
+        
+        Results are memoized by the (hole, board) card masks like _check_for_river_nuts.
         """
-        try:
-            # Must have exactly 2 hole cards
-            if len(hole_cards) != 2:
-                return False
-            
-            # Must have at least 3 community cards to form a 5-card hand
-            if len(community_cards) < 3:
-                return False
-            
-            # Evaluate the player's best 5-card hand
-            player_hand_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
-            
-            # Check if the player's hand uses at least one hole card
-            if not self.engine._uses_at_least_one_hole_card(hole_cards, community_cards):
-                return False
-            
-            # Find the absolute best possible hand given the current board
-            # Pass all known cards (hole + community) to exclude them from remaining deck
-            all_known_cards = hole_cards + community_cards
-            best_possible_strength = self.engine._find_best_possible_hand_strength_excluding_known(community_cards, all_known_cards)
-            
-            # Return true if player's hand is the best possible hand (or tied for best)
-            # In phevaluator, lower numbers are better, so nuts means player_strength <= best_possible
-            result = player_hand_strength <= best_possible_strength
-            
-            if result:
-                logger.info(f"NUTS detected for completed hand: player_strength={player_hand_strength}, best_possible={best_possible_strength}")
-            
-            return result
-            
-        except Exception as e:
-            logger.warning(f"Error checking completed nuts: {e}")
+        return self._completed_nuts_cached(
+            self.engine.cards_to_mask(hole_cards), self.engine.cards_to_mask(community_cards)
+        )
+    
+    def _completed_nuts_for_masks(self, hole_mask: int, community_mask: int) -> bool:
+        """Check for completed nuts with the hand given as card masks."""
+        hole_cards = self.engine.mask_to_cards(hole_mask)
+        community_cards = self.engine.mask_to_cards(community_mask)
+        
+        # Must have exactly 2 hole cards
+        if len(hole_cards) != 2:
+            return False
+        
+        # Must have at least 3 community cards to form a 5-card hand
+        if len(community_cards) < 3:
+            return False
+        
+        # Evaluate the player's best 5-card hand
+        player_hand_strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
+        
+        # Check if the player's hand uses at least one hole card
+        if not self.engine._uses_at_least_one_hole_card(hole_cards, community_cards, player_hand_strength):
             return False
+        
+        # Find the absolute best possible hand given the current board
+        # Pass all known cards (hole + community) to exclude them from remaining deck
+        best_possible_strength = self.engine._find_best_possible_hand_strength_excluding_known(
+            community_cards, hole_mask | community_mask
+        )
+        
+        # Return true if player's hand is the best possible hand (or tied for best)
+        # In phevaluator, lower numbers are better, so nuts means player_strength <= best_possible
+        result = player_hand_strength <= best_possible_strength
+        
+        if result:
+            logger.info("NUTS detected for completed hand: player_strength=%d, best_possible=%d",
+                        player_hand_strength, best_possible_strength)
+        
+        return result
     
     def _calculate_flop_probability(self, num_outs: int) -> float:
         """
@@ -151,13 +242,7 @@ class PotOddsCalculator:
             return 0.0
         if num_outs >= 47:
             return 1.0
-        
-        miss_turn = (47 - num_outs) / 47
-        miss_river = (46 - num_outs) / 46
-        miss_both = miss_turn * miss_river
-        win_probability = 1 - miss_both
-        
-        return win_probability
+        return FLOP_PROBABILITIES[num_outs]
     
     def _calculate_turn_probability(self, num_outs: int) -> float:
         """
@@ -168,34 +253,23 @@ class PotOddsCalculator:
             return 0.0
         if num_outs >= 46:
             return 1.0
-        
-        return num_outs / 46
+        return TURN_PROBABILITIES[num_outs]
     
     def _format_pot_odds_ratio(self, win_probability: float) -> str:
         """
         Format pot odds ratio as X.X:1, rounded to first decimal.
         If decimal is .0, show as integer (e.g., 4:1 instead of 4.0:1).
         """
-        if win_probability <= 0:
-            return "999.0:1"
-        if win_probability >= 1:
-            return "0.0:1"
-        
-        lose_probability = 1 - win_probability
-        ratio = lose_probability / win_probability
-        
-        # Round to 1 decimal place
-        ratio_rounded = round(ratio, 1)
-        
-        # Format as string
-        if ratio_rounded == int(ratio_rounded):
-            return f"{int(ratio_rounded)}:1"
-        else:
-            return f"{ratio_rounded}:1"
+        return _format_pot_odds_ratio(win_probability)
     
     def get_probability_breakdown(self, hole_cards: List[Card], community_cards: List[Card]) -> dict:
-        """Get detailed probability breakdown for analysis."""
-        outs = self.outs_detector.find_outs(hole_cards, community_cards)
+        """
+        Get detailed probability breakdown for analysis.
+        
+        Outs come from the detector's memo, so a hand already sent through
+        calculate_pot_odds doesn't repeat the search.
+        """
+        outs = self.outs_detector.find_out_entries(hole_cards, community_cards)
         num_outs = len(outs)
         cards_seen = len(hole_cards) + len(community_cards)
         
@@ -208,10 +282,9 @@ class PotOddsCalculator:
         
         # Group outs by draw type
         for out in outs:
-            draw_type = out['draw_type']
-            if draw_type not in breakdown['outs_by_type']:
-                breakdown['outs_by_type'][draw_type] = []
-            breakdown['outs_by_type'][draw_type].append(out['card'])
+            if out.draw_type not in breakdown['outs_by_type']:
+                breakdown['outs_by_type'][out.draw_type] = []
+            breakdown['outs_by_type'][out.draw_type].append(out.card)
         
         # Calculate probabilities for different scenarios
         if cards_seen == 5:  # Flop
@@ -227,86 +300,22 @@ class PotOddsCalculator:
         
         return breakdown
     
-    def calculate_exact_odds_from_examples(self) -> dict:
+    def calculate_exact_odds_from_examples(self) -> Mapping[str, Mapping[str, object]]:
         """
         Calculate exact odds for the examples from specifications.
         Used for verification and testing.
-        """
-        examples = {
-            '4_outs_flop': {
-                'probability': self._calculate_flop_probability(4),
-                'ratio': self._format_pot_odds_ratio(self._calculate_flop_probability(4)),
-                'expected': '5.1:1'
-            },
-            '4_outs_turn': {
-                'probability': self._calculate_turn_probability(4),
-                'ratio': self._format_pot_odds_ratio(self._calculate_turn_probability(4)),
-                'expected': '10.5:1'
-            },
-            '6_outs_flop': {
-                'probability': self._calculate_flop_probability(6),
-                'ratio': self._format_pot_odds_ratio(self._calculate_flop_probability(6)),
-                'expected': '3.1:1'
-            },
-            '8_outs_flop': {
-                'probability': self._calculate_flop_probability(8),
-                'ratio': self._format_pot_odds_ratio(self._calculate_flop_probability(8)),
-                'expected': '2.2:1'
-            },
-            '9_outs_flop': {
-                'probability': self._calculate_flop_probability(9),
-                'ratio': self._format_pot_odds_ratio(self._calculate_flop_probability(9)),
-                'expected': '1.9:1'
-            },
-            '15_outs_flop': {
-                'probability': self._calculate_flop_probability(15),
-                'ratio': self._format_pot_odds_ratio(self._calculate_flop_probability(15)),
-                'expected': '0.85:1'
-            }
-        }
         
-        return examples
+        The examples are fixed, so they're computed once at import (read-only).
+        """
+        return EXACT_ODDS_EXAMPLES
 
 
-# Numba optimized version for better performance
-try:
-    from numba import jit
+class OptimizedPotOddsCalculator(PotOddsCalculator):
+    """Pot odds calculator running the outs search in a Numba kernel."""
     
-    @jit(nopython=True)
-    def _numba_calculate_flop_probability(num_outs: int) -> float:
-        """Numba-optimized flop probability calculation."""
-        if num_outs <= 0:
-            return 0.0
-        if num_outs >= 47:
-            return 1.0
-        
-        miss_turn = (47 - num_outs) / 47
-        miss_river = (46 - num_outs) / 46
-        miss_both = miss_turn * miss_river
-        return 1 - miss_both
+    __slots__ = ()
     
-    @jit(nopython=True)
-    def _numba_calculate_turn_probability(num_outs: int) -> float:
-        """Numba-optimized turn probability calculation."""
-        if num_outs <= 0:
-            return 0.0
-        if num_outs >= 46:
-            return 1.0
-        
-        return num_outs / 46
-    
-    class OptimizedPotOddsCalculator(PotOddsCalculator):
-        """Numba-optimized version of pot odds calculator."""
-        
-        def _calculate_flop_probability(self, num_outs: int) -> float:
-            return _numba_calculate_flop_probability(num_outs)
-        
-        def _calculate_turn_probability(self, num_outs: int) -> float:
-            return _numba_calculate_turn_probability(num_outs)
-        
-        # NUTS detection doesn't need optimization since it's not performance-critical
-        # and relies on complex object operations that aren't easily optimized with Numba
-
-except ImportError:
-    logger.warning("Numba not available, using standard calculator")
-    OptimizedPotOddsCalculator = PotOddsCalculator
\ No newline at end of file
+    def __init__(self, poker_engine: PokerEngine):
+        super().__init__(poker_engine)
+        # Falls back to the standard detector when Numba isn't installed
+        self.outs_detector = OptimizedOutsDetector(poker_engine)
@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    API test client shared by the whole session.
+    
+    main builds its poker engine and calculator at import time, so every
+    test reuses those instead of constructing its own.
+    """
+    return TestClient(app)
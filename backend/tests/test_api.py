@@ -1,23 +1,15 @@
 """Tests for FastAPI endpoints."""
 
+import logging
+import re
 import pytest
-from fastapi.testclient import TestClient
-from main import app
 import main
-from poker_engine import PokerEngine
-from pot_odds_calculator import OptimizedPotOddsCalculator
-
-# Initialize components for testing
-main.poker_engine = PokerEngine()
-main.calculator = OptimizedPotOddsCalculator(main.poker_engine)
-
-client = TestClient(app)
 
 
 class TestAPIEndpoints:
     """Test API endpoint functionality."""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test root endpoint."""
         response = client.get("/")
         
@@ -30,7 +22,7 @@ class TestAPIEndpoints:
         assert data["endpoints"]["calculate"] == "/api/calculate"
         assert data["endpoints"]["health"] == "/health"
     
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, client):
         """Test health check endpoint."""
         response = client.get("/health")
         
@@ -40,7 +32,7 @@ class TestAPIEndpoints:
         assert data["status"] == "healthy"
         assert data["version"] == "0.1.0"
     
-    def test_calculate_endpoint_valid_request(self):
+    def test_calculate_endpoint_valid_request(self, client):
         """Test calculate endpoint with valid request."""
         request_data = {
             "hole_cards": ["As", "Kh"],
@@ -71,7 +63,7 @@ class TestAPIEndpoints:
             assert "draw_type" in out
             assert len(out["card"]) == 2  # Card notation like "As"
     
-    def test_calculate_endpoint_inside_straight_draw(self):
+    def test_calculate_endpoint_inside_straight_draw(self, client):
         """Test calculate endpoint with inside straight draw."""
         request_data = {
             "hole_cards": ["9s", "8h"],
@@ -91,7 +83,7 @@ class TestAPIEndpoints:
         for out in seven_outs:
             assert "straight" in out["draw_type"]  # Can be straight_gutshot or straight_open_ended
     
-    def test_calculate_endpoint_flush_draw(self):
+    def test_calculate_endpoint_flush_draw(self, client):
         """Test calculate endpoint with flush draw."""
         request_data = {
             "hole_cards": ["7s", "3s"],  # 2 spades
@@ -116,7 +108,7 @@ class TestAPIEndpoints:
         # With a weak hand, many cards can be outs, so allow a broader range
         assert len(data["outs"]) <= 50
     
-    def test_calculate_endpoint_two_overcards(self):
+    def test_calculate_endpoint_two_overcards(self, client):
         """Test calculate endpoint with two overcards."""
         request_data = {
             "hole_cards": ["As", "Kd"],
@@ -135,7 +127,7 @@ class TestAPIEndpoints:
         assert len(ace_outs) == 3
         assert len(king_outs) == 3
     
-    def test_calculate_endpoint_no_community_cards(self):
+    def test_calculate_endpoint_no_community_cards(self, client):
         """Test calculate endpoint with no community cards."""
         request_data = {
             "hole_cards": ["As", "Kh"],
@@ -151,7 +143,43 @@ class TestAPIEndpoints:
         assert "pot_odds_ratio" in data
         assert "outs" in data
     
-    def test_calculate_endpoint_invalid_card_notation(self):
+    def test_calculate_endpoint_cache_is_order_independent(self, client):
+        """Test that reordered cards reuse the cached calculation."""
+        request_data = {
+            "hole_cards": ["Kd", "As"],
+            "community_cards": ["2s", "7h", "Qc"]
+        }
+        reordered_data = {
+            "hole_cards": ["As", "Kd"],
+            "community_cards": ["Qc", "2s", "7h"]
+        }
+        
+        first = client.post("/api/calculate", json=request_data)
+        hits_before = main._cached_calculation.cache_info().hits
+        second = client.post("/api/calculate", json=reordered_data)
+        
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert main._cached_calculation.cache_info().hits == hits_before + 1
+        assert first.json() == second.json()
+    
+    def test_calculate_endpoint_value_error_handled_by_app(self, client, monkeypatch):
+        """Test that a ValueError from the calculation reaches the app-level 422 handler."""
+        def raise_value_error(hole_mask, community_mask):
+            raise ValueError("Duplicate cards found")
+        
+        monkeypatch.setattr(main, "_cached_calculation", raise_value_error)
+        request_data = {
+            "hole_cards": ["As", "Kh"],
+            "community_cards": ["Qs", "Jd", "Tc"]
+        }
+        
+        response = client.post("/api/calculate", json=request_data)
+        
+        assert response.status_code == 422
+        assert response.json() == {"detail": "Duplicate cards found"}
+    
+    def test_calculate_endpoint_invalid_card_notation(self, client):
         """Test calculate endpoint with invalid card notation."""
         request_data = {
             "hole_cards": ["Xx", "Kh"],
@@ -164,7 +192,7 @@ class TestAPIEndpoints:
         data = response.json()
         assert "detail" in data
     
-    def test_calculate_endpoint_duplicate_cards(self):
+    def test_calculate_endpoint_duplicate_cards(self, client):
         """Test calculate endpoint with duplicate cards."""
         request_data = {
             "hole_cards": ["As", "As"],  # Duplicate ace of spades
@@ -175,7 +203,7 @@ class TestAPIEndpoints:
         
         assert response.status_code == 422
     
-    def test_calculate_endpoint_duplicate_across_holes_and_community(self):
+    def test_calculate_endpoint_duplicate_across_holes_and_community(self, client):
         """Test calculate endpoint with duplicates across hole and community cards."""
         request_data = {
             "hole_cards": ["As", "Kh"],
@@ -185,8 +213,10 @@ class TestAPIEndpoints:
         response = client.post("/api/calculate", json=request_data)
         
         assert response.status_code == 422
+        # Rejected by the CalculateRequest model validator, not the endpoint body
+        assert "Duplicate cards found across hole cards and community cards" in str(response.json()["detail"])
     
-    def test_calculate_endpoint_wrong_number_of_hole_cards(self):
+    def test_calculate_endpoint_wrong_number_of_hole_cards(self, client):
         """Test calculate endpoint with wrong number of hole cards."""
         request_data = {
             "hole_cards": ["As"],  # Should be exactly 2
@@ -197,7 +227,7 @@ class TestAPIEndpoints:
         
         assert response.status_code == 422
     
-    def test_calculate_endpoint_too_many_community_cards(self):
+    def test_calculate_endpoint_too_many_community_cards(self, client):
         """Test calculate endpoint with too many community cards."""
         request_data = {
             "hole_cards": ["As", "Kh"],
@@ -208,7 +238,7 @@ class TestAPIEndpoints:
         
         assert response.status_code == 422
     
-    def test_calculate_endpoint_missing_hole_cards(self):
+    def test_calculate_endpoint_missing_hole_cards(self, client):
         """Test calculate endpoint with missing hole cards."""
         request_data = {
             "community_cards": ["Qs", "Jd", "Tc"]
@@ -219,19 +249,19 @@ class TestAPIEndpoints:
         
         assert response.status_code == 422
     
-    def test_calculate_endpoint_empty_request(self):
+    def test_calculate_endpoint_empty_request(self, client):
         """Test calculate endpoint with empty request."""
         response = client.post("/api/calculate", json={})
         
         assert response.status_code == 422
     
-    def test_calculate_endpoint_malformed_json(self):
+    def test_calculate_endpoint_malformed_json(self, client):
         """Test calculate endpoint with malformed JSON."""
         response = client.post("/api/calculate", data="not json")
         
         assert response.status_code == 422
     
-    def test_calculate_endpoint_royal_flush(self):
+    def test_calculate_endpoint_royal_flush(self, client):
         """Test calculate endpoint with royal flush (no outs)."""
         request_data = {
             "hole_cards": ["As", "Ks"],
@@ -250,7 +280,78 @@ class TestAPIEndpoints:
         ratio = data["pot_odds_ratio"]
         assert ratio == "NUTS!"
     
-    def test_response_schema_validation(self):
+    def test_calculate_endpoint_no_outs_uses_preserialized_body(self, client):
+        """Test results without outs are served from the pre-serialized bodies."""
+        nuts = client.post("/api/calculate", json={
+            "hole_cards": ["As", "Ks"],
+            "community_cards": ["Qs", "Js", "Ts"]
+        })
+        river = client.post("/api/calculate", json={
+            "hole_cards": ["2c", "7d"],
+            "community_cards": ["As", "Kh", "Qd", "9s", "4h"]
+        })
+        
+        assert nuts.status_code == 200
+        assert nuts.headers["content-type"] == "application/json"
+        assert nuts.content == main.NO_OUTS_RESPONSE_BODIES["NUTS!"]
+        assert nuts.json() == {"pot_odds_ratio": "NUTS!", "outs": []}
+        assert river.content == main.NO_OUTS_RESPONSE_BODIES["999.0:1"]
+        assert river.json() == {"pot_odds_ratio": "999.0:1", "outs": []}
+    
+    def test_request_log_timestamp_is_readable(self, client, caplog):
+        """Test request logs go through stdlib logging and format with a readable timestamp."""
+        caplog.set_level(logging.DEBUG, logger="main")
+        
+        client.post("/api/calculate", json={
+            "hole_cards": ["9s", "8s"],
+            "community_cards": ["7h", "6s", "2s"]
+        })
+        
+        records = [record for record in caplog.records if record.name == "main"]
+        assert records
+        line = logging.Formatter(main.LOG_FORMAT).format(records[-1])
+        assert re.match(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - main - DEBUG - ", line), line
+    
+    def test_debug_examples_in_debug_mode(self, client, monkeypatch):
+        """Test the debug examples endpoint works in debug mode without the app lifespan."""
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+        
+        response = client.get("/api/debug/examples")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["4_outs_flop"]["expected"] == "5.1:1"
+        assert data["9_outs_flop"]["ratio"] == data["9_outs_flop"]["expected"]
+    
+    def test_calculate_many_matches_single_requests(self, client):
+        """Test batch results match single calculations, in request order."""
+        hands = [
+            {"hole_cards": ["As", "Kh"], "community_cards": ["Qs", "Jd", "Tc"]},
+            {"hole_cards": ["9s", "8s"], "community_cards": ["7h", "6s", "2s"]},
+            {"hole_cards": ["Ah", "Kh"], "community_cards": ["Qh", "Jh", "Th"]},
+            {"hole_cards": ["As", "Kh"], "community_cards": ["Qs", "Jd", "Tc"]}
+        ]
+        
+        response = client.post("/api/calculate_many", json={"hands": hands})
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == len(hands)
+        for hand, result in zip(hands, results):
+            assert result == client.post("/api/calculate", json=hand).json()
+    
+    def test_calculate_many_rejects_invalid_hands(self, client):
+        """Test a batch with an invalid hand or no hands is rejected."""
+        invalid_card = client.post("/api/calculate_many", json={"hands": [
+            {"hole_cards": ["As", "Kh"], "community_cards": ["Qs"]},
+            {"hole_cards": ["Xx", "Kh"], "community_cards": []}
+        ]})
+        empty = client.post("/api/calculate_many", json={"hands": []})
+        
+        assert invalid_card.status_code == 422
+        assert empty.status_code == 422
+    
+    def test_response_schema_validation(self, client):
         """Test that response matches expected schema."""
         # Use a non-nuts hand to test normal ratio format
         request_data = {
@@ -290,7 +391,7 @@ class TestAPIEndpoints:
             assert out["card"][1] in "shdc"
 
 
-def test_calculate_endpoint_nuts_royal_flush_draw():
+def test_calculate_endpoint_nuts_royal_flush_draw(client):
     """Test calculate endpoint with royal flush draw that results in NUTS."""
     # Hand: As 9h, Board: Ks Qs Js (Ten of spades completes royal flush)
     request_data = {
@@ -316,7 +417,7 @@ def test_calculate_endpoint_nuts_royal_flush_draw():
         assert ":" in data["pot_odds_ratio"]
 
 
-def test_calculate_endpoint_nuts_nut_flush_draw():
+def test_calculate_endpoint_nuts_nut_flush_draw(client):
     """Test calculate endpoint with nut flush draw - should return normal odds, not NUTS."""
     # Hand: As Ks, Board: Qs Js 7h (no pairs, any spade completes nut flush)
     request_data = {
@@ -338,7 +439,7 @@ def test_calculate_endpoint_nuts_nut_flush_draw():
     assert len(flush_outs) >= 9  # Should find 9 spades
 
 
-def test_calculate_endpoint_nuts_broadway_straight():
+def test_calculate_endpoint_nuts_broadway_straight(client):
     """Test calculate endpoint with Broadway straight draw - should return normal odds, not NUTS."""
     # Hand: As Kd, Board: Qh Jc 2s (Ten completes Broadway straight)
     request_data = {
@@ -360,7 +461,7 @@ def test_calculate_endpoint_nuts_broadway_straight():
     assert len(straight_outs) >= 4  # Should find 4 tens
 
 
-def test_calculate_endpoint_api_spec_royal_flush_example():
+def test_calculate_endpoint_api_spec_royal_flush_example(client):
     """Test the specific royal flush example from API spec."""
     request_data = {
         "hole_cards": ["Ah", "Kh"],
@@ -0,0 +1,38 @@
+"""Tests for the Cactus Kev hand evaluator."""
+
+import random
+from itertools import combinations
+import pytest
+from phevaluator import evaluate_cards
+from ckc_eval import best_strength_for_any_hole_cards
+
+
+class TestCactusKevEvaluator:
+    """Test ckc_eval ranks hands exactly like phevaluator."""
+    
+    def test_evaluate_ids_matches_phevaluator(self):
+        """Test random 5-7 card hands get the same rank as evaluate_cards."""
+        np = pytest.importorskip("numpy")
+        evaluate_ids = pytest.importorskip("ckc_eval").evaluate_ids
+        rng = random.Random(7)
+        for _ in range(5000):
+            card_ids = rng.sample(range(52), rng.choice([5, 6, 7]))
+            
+            assert evaluate_ids(np.array(card_ids, dtype=np.int64)) == evaluate_cards(*card_ids)
+    
+    @pytest.mark.parametrize("num_board", [3, 4, 5])
+    def test_best_strength_for_any_hole_cards(self, num_board):
+        """Test the nuts search matches a brute force over phevaluator."""
+        rng = random.Random(num_board)
+        board_ids = rng.sample(range(52), num_board)
+        remaining_ids = [card_id for card_id in range(52) if card_id not in board_ids]
+        
+        expected = min(
+            evaluate_cards(*board_ids, first, second)
+            for first, second in combinations(remaining_ids, 2)
+        )
+        assert best_strength_for_any_hole_cards(board_ids, remaining_ids) == expected
+    
+    def test_best_strength_too_few_cards(self):
+        """Test boards too small to make a five-card hand give the worst strength."""
+        assert best_strength_for_any_hole_cards([0, 5], list(range(10, 20))) == 9999
@@ -4,6 +4,8 @@ import pytest
 from pydantic import ValidationError
 from models import (
     CalculateRequest,
+    CalculateManyRequest,
+    MAX_BATCH_HANDS,
     CalculationResponse, 
     HealthResponse,
     OutCard,
@@ -103,6 +105,14 @@ class TestCalculateRequest:
                 community_cards=["Qs", "Qs", "Tc"]
             )
     
+    def test_invalid_card_reported_before_duplicates(self):
+        """Test the invalid card is named even when the list also has duplicates."""
+        with pytest.raises(ValidationError, match="Invalid card notation: Xx"):
+            CalculateRequest(
+                hole_cards=["As", "Kh"],
+                community_cards=["Qs", "Qs", "Xx"]
+            )
+    
     def test_duplicate_across_hole_and_community(self):
         """Test duplicate cards across hole and community cards."""
         with pytest.raises(ValidationError, match="Duplicate cards found"):
@@ -178,6 +188,29 @@ class TestCalculationResponse:
             assert response.pot_odds_ratio == ratio
 
 
+class TestCalculateManyRequest:
+    """Test CalculateManyRequest model validation."""
+    
+    def test_valid_batch_request(self):
+        """Test each hand is validated like a single request."""
+        request = CalculateManyRequest(hands=[
+            {"hole_cards": ["As", "Kh"], "community_cards": ["Qs", "Jd", "Tc"]},
+            {"hole_cards": ["9s", "8s"]}
+        ])
+        
+        assert len(request.hands) == 2
+        assert request.hands[1].community_cards == []
+    
+    def test_batch_size_limits(self):
+        """Test empty and oversized batches are rejected."""
+        hand = {"hole_cards": ["As", "Kh"]}
+        
+        with pytest.raises(ValidationError):
+            CalculateManyRequest(hands=[])
+        with pytest.raises(ValidationError):
+            CalculateManyRequest(hands=[hand] * (MAX_BATCH_HANDS + 1))
+
+
 class TestHealthResponse:
     """Test HealthResponse model validation."""
     
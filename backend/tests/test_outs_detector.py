@@ -132,6 +132,30 @@ class TestOutsDetector:
         # Should find no outs (already have best possible hand)
         assert len(outs) == 0, f"Expected 0 outs but found {len(outs)}"
     
+    def test_find_outs_memoized_by_hand(self):
+        """Test repeated hands hit the outs cache regardless of card order."""
+        hole_cards = self.engine.parse_cards(["9s", "8s"])
+        community_cards = self.engine.parse_cards(["7h", "6s", "2s"])
+        
+        outs = self.detector.find_outs(hole_cards, community_cards)
+        outs.clear()  # Callers get their own list, not the cached result
+        hits_before = self.detector._find_outs_cached.cache_info().hits
+        repeat = self.detector.find_outs(hole_cards[::-1], community_cards[::-1])
+        
+        assert self.detector._find_outs_cached.cache_info().hits == hits_before + 1
+        assert len(repeat) == 15
+    
+    def test_find_out_entries(self):
+        """Test find_out_entries returns the same outs as named tuples."""
+        hole_cards = self.engine.parse_cards(["9s", "8s"])
+        community_cards = self.engine.parse_cards(["7h", "6s", "2s"])
+        
+        entries = self.detector.find_out_entries(hole_cards, community_cards)
+        
+        assert isinstance(entries, tuple)
+        assert [entry._asdict() for entry in entries] == \
+            self.detector.find_outs(hole_cards, community_cards)
+    
     
     def test_analyze_flush_draws(self):
         """Test detailed flush draw analysis."""
@@ -191,36 +215,24 @@ class TestOutsDetector:
         # Total outs should be reasonable (combo draw typically 12-15 outs)
         assert analysis['total_outs'] > 0, "Should have some outs for this combo draw"
     
-    def test_documented_examples(self):
-        """Test all examples from outs.md documentation for exact counts."""
-        
-        # 4 outs: Inside straight draw (gutshot)
+    @pytest.mark.parametrize("hole, board, expected_outs, description", [
         # Hand: 9♠ 8♥, Board: 5♣ 6♦ K♠ -> Need 7 for straight
-        hole_cards = self.engine.parse_cards(["9s", "8h"])
-        community_cards = self.engine.parse_cards(["5c", "6d", "Ks"])
-        outs = self.detector.find_outs(hole_cards, community_cards)
-        assert len(outs) == 4, f"Gutshot should have 4 outs, found {len(outs)}"
-        
-        # 6 outs: Two overcards
+        (["9s", "8h"], ["5c", "6d", "Ks"], 4, "Gutshot"),
         # Hand: A♠ K♦, Board: Q♣ 7♥ 2♠ -> Any ace or king makes top pair
-        hole_cards = self.engine.parse_cards(["As", "Kd"])
-        community_cards = self.engine.parse_cards(["Qc", "7h", "2s"])
-        outs = self.detector.find_outs(hole_cards, community_cards)
-        assert len(outs) == 6, f"Two overcards should have 6 outs, found {len(outs)}"
-        
-        # 8 outs: Open-ended straight draw
+        (["As", "Kd"], ["Qc", "7h", "2s"], 6, "Two overcards"),
         # Hand: 9♠ 8♥, Board: 7♣ 6♦ 2♠ -> Need 10 or 5 for straight
-        hole_cards = self.engine.parse_cards(["9s", "8h"])
-        community_cards = self.engine.parse_cards(["7c", "6d", "2s"])
-        outs = self.detector.find_outs(hole_cards, community_cards)
-        assert len(outs) == 8, f"Open-ended straight should have 8 outs, found {len(outs)}"
-        
-        # 9 outs: Flush draw
+        (["9s", "8h"], ["7c", "6d", "2s"], 8, "Open-ended straight"),
         # Hand: A♠ K♠, Board: 7♠ 3♠ J♦ -> Any remaining spade completes flush
-        hole_cards = self.engine.parse_cards(["As", "Ks"])
-        community_cards = self.engine.parse_cards(["7s", "3s", "Jd"])
+        (["As", "Ks"], ["7s", "3s", "Jd"], 9, "Flush draw"),
+    ])
+    def test_documented_examples(self, hole, board, expected_outs, description):
+        """Test all examples from outs.md documentation for exact counts."""
+        hole_cards = self.engine.parse_cards(hole)
+        community_cards = self.engine.parse_cards(board)
+        
         outs = self.detector.find_outs(hole_cards, community_cards)
-        assert len(outs) == 9, f"Flush draw should have 9 outs, found {len(outs)}"
+        
+        assert len(outs) == expected_outs, f"{description} should have {expected_outs} outs, found {len(outs)}"
     
     def test_count_outs_method(self):
         """Test the count_outs convenience method."""
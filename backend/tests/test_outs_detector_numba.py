@@ -0,0 +1,44 @@
+"""Tests for the Numba outs detection pipeline."""
+
+import random
+import pytest
+from poker_engine import PokerEngine
+from outs_detector import OutsDetector
+from outs_detector_numba import OptimizedOutsDetector
+
+
+class TestOptimizedOutsDetector:
+    """Test OptimizedOutsDetector against the pure Python detector."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = PokerEngine()
+        self.detector = OutsDetector(self.engine)
+        self.optimized = OptimizedOutsDetector(self.engine)
+
+    @pytest.mark.parametrize("hole, board", [
+        (["9s", "8s"], ["7h", "6s", "2s"]),   # flush + open-ended straight draw
+        (["Ah", "Kd"], ["7c", "5s", "2h"]),   # two overcards
+        (["7h", "7d"], ["7c", "Ks", "2h"]),   # set
+        (["As", "9h"], ["Ks", "Qs", "Js"]),   # royal flush draw
+        (["Ah", "Kd"], ["7c", "7s", "2h"]),   # paired board
+        (["As", "Ks"], []),                   # preflop
+        (["As", "Ks"], ["Qs", "Js", "Ts"]),   # made royal flush
+    ])
+    def test_matches_python_detector(self, hole, board):
+        """Test known draws produce the same outs, in the same order."""
+        hole_cards = self.engine.parse_cards(hole)
+        community_cards = self.engine.parse_cards(board)
+
+        assert self.optimized.find_outs(hole_cards, community_cards) == \
+            self.detector.find_outs(hole_cards, community_cards)
+
+    def test_matches_python_detector_random_hands(self):
+        """Test random flop and turn hands produce the same outs."""
+        rng = random.Random(42)
+        for _ in range(500):
+            cards = rng.sample(self.engine.deck, rng.choice([5, 6]))
+            hole_cards, community_cards = cards[:2], cards[2:]
+
+            assert self.optimized.find_outs(hole_cards, community_cards) == \
+                self.detector.find_outs(hole_cards, community_cards)
@@ -1,7 +1,9 @@
 """Tests for poker engine functionality."""
 
+from itertools import combinations
 import pytest
-from poker_engine import PokerEngine, Card
+from phevaluator import evaluate_cards
+from poker_engine import PokerEngine, Card, FULL_DECK_MASK, CARD_STRINGS, _evaluate_card_ids
 
 
 class TestCard:
@@ -29,6 +31,13 @@ class TestCard:
         with pytest.raises(ValueError, match="Invalid suit"):
             Card("Ax")
     
+    def test_card_creation_non_ascii(self):
+        """Test characters outside the ASCII range are rejected."""
+        with pytest.raises(ValueError, match="Invalid rank: é"):
+            Card("és")
+        with pytest.raises(ValueError, match="Invalid suit: é"):
+            Card("Aé")
+    
     def test_card_equality(self):
         """Test card equality."""
         card1 = Card("As")
@@ -38,6 +47,12 @@ class TestCard:
         assert card1 == card2
         assert card1 != card3
     
+    def test_card_hash_is_deck_index(self):
+        """Test cards hash by their deck index so equal cards share set entries."""
+        card = Card("As")
+        assert hash(card) == card.index
+        assert len({Card("As"), Card("As"), Card("Ah")}) == 2
+    
     def test_card_string_representation(self):
         """Test card string representation."""
         card = Card("Kd")
@@ -57,6 +72,11 @@ class TestPokerEngine:
         assert len(self.engine.deck) == 52
         assert isinstance(self.engine.deck[0], Card)
     
+    def test_card_strings_match_deck(self):
+        """Test the card string table is indexed by Card.index."""
+        assert CARD_STRINGS == tuple(str(card) for card in self.engine.deck)
+        assert all(CARD_STRINGS[card.index] == str(card) for card in self.engine.deck)
+    
     def test_parse_cards(self):
         """Test parsing card strings to Card objects."""
         cards = self.engine.parse_cards(["As", "Kh", "Qd"])
@@ -67,13 +87,55 @@ class TestPokerEngine:
         assert str(cards[1]) == "Kh"
         assert str(cards[2]) == "Qd"
     
+    def test_parse_cards_reuses_deck_instances(self):
+        """Test that parsed cards are the engine's shared deck cards."""
+        first = self.engine.parse_cards(["As", "Kh"])
+        second = self.engine.parse_cards(["As", "Kh"])
+        
+        assert first[0] is second[0]
+        assert first[1] is second[1]
+        assert first[0] in self.engine.deck
+    
+    def test_parse_cards_invalid(self):
+        """Test that invalid card strings still raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid rank"):
+            self.engine.parse_cards(["As", "Xs"])
+    
+    def test_cards_to_mask_round_trip(self):
+        """Test converting cards to a bitmask and back."""
+        cards = self.engine.parse_cards(["Kh", "2s", "Ac"])
+        mask = self.engine.cards_to_mask(cards)
+        
+        assert bin(mask).count("1") == 3
+        assert self.engine.cards_to_mask(self.engine.deck) == FULL_DECK_MASK
+        # Cards come back in deck order regardless of input order
+        assert [str(card) for card in self.engine.mask_to_cards(mask)] == ["2s", "Kh", "Ac"]
+    
     def test_get_remaining_deck(self):
         """Test getting remaining cards in deck."""
         known_cards = self.engine.parse_cards(["As", "Kh"])
         remaining = self.engine.get_remaining_deck(known_cards)
         
         assert len(remaining) == 50
-        assert not any(str(card) in ["As", "Kh"] for card in remaining)
+        assert {"As", "Kh"}.isdisjoint(map(str, remaining))
+    
+    def test_get_remaining_deck_from_mask(self):
+        """Test a known-card mask gives the same remaining deck as the card list."""
+        known_cards = self.engine.parse_cards(["As", "Kh", "2c"])
+        known_mask = self.engine.cards_to_mask(known_cards)
+        
+        assert self.engine.get_remaining_deck(known_mask) == self.engine.get_remaining_deck(known_cards)
+        assert len(self.engine.get_remaining_deck(known_mask)) == 49
+    
+    def test_parse_cards_to_mask(self):
+        """Test card strings parse straight to the mask of their Card objects."""
+        card_strings = ["As", "Kh", "2c", "Td"]
+        
+        assert self.engine.parse_cards_to_mask(card_strings) == \
+            self.engine.cards_to_mask(self.engine.parse_cards(card_strings))
+        assert self.engine.parse_cards_to_mask([]) == 0
+        with pytest.raises(ValueError, match="Invalid rank"):
+            self.engine.parse_cards_to_mask(["As", "Xs"])
     
     def test_evaluate_hand_strength_royal_flush(self):
         """Test hand evaluation with royal flush."""
@@ -84,6 +146,26 @@ class TestPokerEngine:
         strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
         assert strength <= 10  # Royal flush is strongest
     
+    def test_evaluate_hand_strength_matches_string_evaluation(self):
+        """Test integer card ids rank hands exactly like phevaluator's card strings."""
+        for cards in (["As", "Kd", "Qh", "Jc", "Ts"], ["2c", "2d", "7h", "7s", "Kc", "9d"],
+                      ["Ah", "3h", "5h", "9h", "Jh", "Ks", "Kd"]):
+            hand = self.engine.parse_cards(cards)
+            
+            assert self.engine.evaluate_hand_strength(hand[:2], hand[2:]) == evaluate_cards(*cards)
+    
+    def test_evaluate_hand_strength_memoized(self):
+        """Test the same hand in any card order reuses the cached evaluation."""
+        hole_cards = self.engine.parse_cards(["9h", "4c"])
+        community_cards = self.engine.parse_cards(["Jd", "6s", "2c", "8h"])
+        
+        strength = self.engine.evaluate_hand_strength(hole_cards, community_cards)
+        hits_before = _evaluate_card_ids.cache_info().hits
+        repeat = self.engine.evaluate_hand_strength(community_cards[::-1], hole_cards[::-1])
+        
+        assert repeat == strength
+        assert _evaluate_card_ids.cache_info().hits == hits_before + 1
+    
     def test_evaluate_hand_strength_high_card(self):
         """Test hand evaluation with high card."""
         # High card hand
@@ -141,6 +223,21 @@ class TestPokerEngine:
         assert has_draw is True
         assert 10 in needed_ranks or 5 in needed_ranks
     
+    def test_is_straight_draw_wheel(self):
+        """Test the wheel draw counts the ace low and reports ranks in order."""
+        # A-2-3-4 needs a 5
+        hole_cards = self.engine.parse_cards(["As", "2h"])
+        community_cards = self.engine.parse_cards(["3d", "4c", "Kh"])
+        
+        has_draw, needed_ranks = self.engine.is_straight_draw(hole_cards, community_cards)
+        assert has_draw is True
+        assert needed_ranks == [5]
+        
+        # 2-3-4-5 needs an ace (low) or a 6
+        community_cards = self.engine.parse_cards(["3d", "4c", "5h"])
+        hole_cards = self.engine.parse_cards(["2s", "9h"])
+        assert self.engine.is_straight_draw(hole_cards, community_cards) == (True, [6, 14])
+    
     def test_count_rank_occurrences(self):
         """Test rank counting."""
         cards = self.engine.parse_cards(["As", "Ah", "Kd", "Kc"])
@@ -149,6 +246,35 @@ class TestPokerEngine:
         assert counts[14] == 2  # Two aces
         assert counts[13] == 2  # Two kings
     
+    def test_count_rank_occurrences_array(self):
+        """Test rank counting into a value-indexed array."""
+        cards = self.engine.parse_cards(["As", "Ah", "Kd", "Kc", "2s"])
+        counts = self.engine.count_rank_occurrences_array(cards)
+        
+        assert len(counts) == 15
+        assert counts[14] == 2  # Two aces
+        assert counts[13] == 2  # Two kings
+        assert counts[2] == 1
+        assert sum(counts) == 5
+    
+    def test_count_suit_occurrences_array(self):
+        """Test suit counting into an array indexed by Card.suit_index."""
+        cards = self.engine.parse_cards(["As", "Ks", "Qs", "2h", "3c"])
+        counts = self.engine.count_suit_occurrences_array(cards)
+        
+        assert list(counts) == [3, 1, 0, 1]  # s, h, d, c
+        assert Card.SUITS[cards[3].suit_index] == "h"
+    
+    def test_get_suit_rank_masks(self):
+        """Test per-suit rank bitmasks and the straight flush check built on them."""
+        cards = self.engine.parse_cards(["As", "2s", "3s", "4s", "5s", "Kh"])
+        suit_rank_masks = self.engine.get_suit_rank_masks(cards)
+        
+        assert suit_rank_masks[Card.SUITS.index("s")] == (1 << 14) | 0b111100
+        assert suit_rank_masks[Card.SUITS.index("h")] == 1 << 13
+        assert self.engine._has_straight_flush_potential(suit_rank_masks[0])  # Wheel
+        assert not self.engine._has_straight_flush_potential(suit_rank_masks[0] & ~(1 << 3))
+    
     def test_get_pairs_and_sets(self):
         """Test pairs and sets detection."""
         # Two pair: A-A-K-K-Q
@@ -173,98 +299,68 @@ class TestPokerEngine:
         assert has_draw is True
         assert suit == "s"
     
-    def test_is_nuts_when_completed_royal_flush(self):
-        """Test NUTS detection with royal flush completion."""
-        # Test case 1: Hole cards that DON'T complete royal flush
-        # Hole cards: 9h 8c, Board: As Ks Qs Js (completing card Ts gives royal, but we don't have it)
-        hole_cards = self.engine.parse_cards(["9h", "8c"])
-        community_cards = self.engine.parse_cards(["As", "Ks", "Qs", "Js"])
-        completing_card = Card("Ts")  # Completes royal flush, but not using our hole cards
-        
-        # This should be False since our hole cards (9h, 8c) don't contribute to royal flush
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is False
-        
-        # Test case 2: Hole cards that DO complete royal flush
-        # Hole cards: As 9h, Board: Ks Qs Js (completing card Ts gives royal using As)
-        hole_cards = self.engine.parse_cards(["As", "9h"])
-        community_cards = self.engine.parse_cards(["Ks", "Qs", "Js"])
-        completing_card = Card("Ts")  # Completes royal flush using our As
-        
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is True
-    
-    def test_is_nuts_when_completed_straight_flush(self):
-        """Test NUTS detection with straight flush completion."""
-        # Board has potential for straight flush, but not the absolute nuts
-        hole_cards = self.engine.parse_cards(["9s", "8s"])
-        community_cards = self.engine.parse_cards(["7s", "6s", "2h"])
-        completing_card = Card("Ts")  # Completes 10-high straight flush
-        
-        # This should be nuts if no royal flush is possible
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is True
-    
-    def test_is_nuts_when_completed_not_using_both_hole_cards(self):
-        """Test NUTS detection when completed hand doesn't use both hole cards."""
-        # Board that makes royal flush without needing hole cards
-        hole_cards = self.engine.parse_cards(["2h", "3c"])  # Irrelevant low cards
-        community_cards = self.engine.parse_cards(["As", "Ks", "Qs", "Js"])
-        completing_card = Card("Ts")  # Completes royal flush on board
-        
-        # This should be False because it doesn't use both hole cards meaningfully
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is False
-    
-    def test_is_nuts_when_completed_quads(self):
-        """Test NUTS detection with four of a kind."""
-        # Pocket aces with paired board
-        hole_cards = self.engine.parse_cards(["As", "Ah"])
-        community_cards = self.engine.parse_cards(["Ad", "Kh", "Kd"])
-        completing_card = Card("Ac")  # Completes quad aces (nuts)
+    @pytest.mark.parametrize("hole, board, completing, expected", [
+        # Ts makes a royal flush on the board without our 9h 8c
+        (["9h", "8c"], ["As", "Ks", "Qs", "Js"], "Ts", False),
+        # Ts makes a royal flush using our As
+        (["As", "9h"], ["Ks", "Qs", "Js"], "Ts", True),
+        # Ts makes a 10-high straight flush and no royal flush is possible
+        (["9s", "8s"], ["7s", "6s", "2h"], "Ts", True),
+        # Ts makes a royal flush on the board; the low hole cards don't play
+        (["2h", "3c"], ["As", "Ks", "Qs", "Js"], "Ts", False),
+        # Ac makes quad aces
+        (["As", "Ah"], ["Ad", "Kh", "Kd"], "Ac", True),
+        # Kc makes a full house, but Ks would make four kings
+        (["3s", "3h"], ["3d", "Kh", "Kd"], "Kc", False),
+        # Ac makes quad aces on a board with no straight flush possible
+        (["As", "Ah"], ["Ad", "Kh", "Qs"], "Ac", True),
+        # 2s makes the nut flush on an unpaired board
+        (["As", "Ks"], ["Qs", "Js", "7h"], "2s", True),
+        # Th makes the Broadway straight
+        (["As", "Kd"], ["Qh", "Jc", "2s"], "Th", True),
+    ], ids=[
+        "royal_flush_on_board", "royal_flush", "straight_flush", "not_using_both_hole_cards",
+        "quads", "full_house_not_nuts", "quads_over_full_house", "flush", "straight",
+    ])
+    def test_is_nuts_when_completed(self, hole, board, completing, expected):
+        """Test NUTS detection for hands completed by one more card."""
+        hole_cards = self.engine.parse_cards(hole)
+        community_cards = self.engine.parse_cards(board)
         
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is True
+        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, Card(completing))
+        assert is_nuts is expected
     
-    def test_is_nuts_when_completed_full_house_not_nuts(self):
-        """Test NUTS detection with full house that's not the nuts."""
-        # Full house when four of a kind is possible
-        hole_cards = self.engine.parse_cards(["3s", "3h"])
-        community_cards = self.engine.parse_cards(["3d", "Kh", "Kd"])
-        completing_card = Card("Kc")  # Completes full house, but four Kings is possible with Ks
+    def test_best_possible_hand_strength_memoized(self):
+        """Test repeated nuts searches over the same board reuse the cached result."""
+        board = self.engine.parse_cards(["Qs", "Jd", "7c", "7h", "2s"])
+        known_cards = self.engine.parse_cards(["As", "Kd"]) + board
         
-        # This should be False because someone with Ks would have four Kings
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is False
+        strength = self.engine._find_best_possible_hand_strength_excluding_known(board, known_cards)
+        cache_before = self.engine._best_hand_cached.cache_info()
+        repeat = self.engine._find_best_possible_hand_strength_excluding_known(board[::-1], known_cards[::-1])
+        cache_after = self.engine._best_hand_cached.cache_info()
         
-        # Test a case where full house IS the nuts
-        # Board where no quads are possible
-        hole_cards = self.engine.parse_cards(["As", "Ah"])
-        community_cards = self.engine.parse_cards(["Ad", "Kh", "Qs"])
-        completing_card = Card("Ac")  # Completes quad Aces (definitely nuts)
-        
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is True
+        assert repeat == strength
+        assert self.engine.get_hand_type_from_rank(strength) == "four_of_a_kind"  # Quad sevens
+        assert cache_after.misses == cache_before.misses
+        assert cache_after.hits > cache_before.hits
     
-    def test_is_nuts_when_completed_flush(self):
-        """Test NUTS detection with nut flush."""
-        # Nut flush draw on a board where no full house/quads are possible
-        hole_cards = self.engine.parse_cards(["As", "Ks"])  # Ace high flush
-        community_cards = self.engine.parse_cards(["Qs", "Js", "7h"])  # No pairs on board
-        completing_card = Card("2s")  # Completes nut flush
+    def test_best_possible_hand_strength_with_blocked_nuts(self):
+        """Test hole cards blocking the board's nuts fall back to the excluded-card search."""
+        board = self.engine.parse_cards(["Ks", "Qs", "Js", "7h", "2c"])
         
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is True
-    
-    def test_is_nuts_when_completed_straight(self):
-        """Test NUTS detection with nut straight."""
-        # Nut straight draw
-        hole_cards = self.engine.parse_cards(["As", "Kd"])
-        community_cards = self.engine.parse_cards(["Qh", "Jc", "2s"])
-        completing_card = Card("Th")  # Completes Broadway straight (nuts)
+        # With As held, the royal flush is blocked: Ts 9s for the king-high straight flush is best
+        blocker = self.engine.parse_cards(["As", "9d"])
+        strength = self.engine._find_best_possible_hand_strength_excluding_known(board, blocker + board)
+        assert strength == 2
+        
+        # Unrelated hole cards leave the royal flush available
+        other = self.engine.parse_cards(["3d", "4d"])
+        assert self.engine._find_best_possible_hand_strength_excluding_known(board, other + board) == 1
         
-        is_nuts = self.engine.is_nuts_when_completed(hole_cards, community_cards, completing_card)
-        assert is_nuts is True
+        # Known cards may also be given as a mask
+        known_mask = self.engine.cards_to_mask(blocker + board)
+        assert self.engine._find_best_possible_hand_strength_excluding_known(board, known_mask) == 2
     
     def test_uses_both_hole_cards_simple(self):
         """Test the _uses_both_hole_cards method."""
@@ -282,6 +378,56 @@ class TestPokerEngine:
         uses_both = self.engine._uses_both_hole_cards(hole_cards, board)
         assert uses_both is False
     
+    def test_uses_at_least_one_hole_card_ranks_board_directly(self):
+        """Test the board-only comparison isn't skewed by cards that would pair the board."""
+        # 4-3 kicks the K-J-9-7 above the board's deuce; two spare deuces would make trips
+        hole_cards = self.engine.parse_cards(["3s", "4h"])
+        board = self.engine.parse_cards(["2d", "7c", "9h", "Jd", "Kc"])
+        
+        assert self.engine._uses_at_least_one_hole_card(hole_cards, board) is True
+        
+        # Playing the board: the hole cards don't beat its own five cards
+        hole_cards = self.engine.parse_cards(["2h", "3c"])
+        board = self.engine.parse_cards(["As", "Ks", "Qs", "Js", "Ts"])
+        
+        assert self.engine._uses_at_least_one_hole_card(hole_cards, board) is False
+    
+    def test_has_straight_flush_potential_all_rank_masks(self):
+        """Test the shifted-AND straight check against every set of suited ranks."""
+        straights = [range(low, low + 5) for low in range(2, 11)] + [(14, 2, 3, 4, 5)]
+        for ranks_held in range(1 << 13):
+            mask = ranks_held << 2  # Bit n = card value n
+            expected = any(all(mask >> value & 1 for value in straight) for straight in straights)
+            
+            assert self.engine._has_straight_flush_potential(mask) == expected
+    
+    @pytest.mark.parametrize("board, lower_bound", [
+        (["Ks", "Qs", "Js"], 0),               # Straight flush possible
+        (["Kd", "Kh", "7c", "2s"], 11),        # Paired board: quads possible
+        (["Kd", "9d", "4d", "2s"], 323),       # Three suited, no straight flush
+        (["Kd", "Qh", "Jc", "2s"], 1600),      # Straight possible
+        (["Kd", "8h", "3c", "2s", "9d"], 1610),  # Best hand is a set
+    ])
+    def test_board_rank_lower_bound(self, board, lower_bound):
+        """Test the board texture bound never exceeds the real best hand."""
+        board_cards = self.engine.parse_cards(board)
+        
+        assert self.engine._board_rank_lower_bound(board_cards) == lower_bound
+        assert lower_bound <= self.engine._find_best_possible_hand_strength(board_cards)
+    
+    def test_best_strength_search_covers_every_pair(self):
+        """Test the pruned nuts search matches a search over every remaining pair."""
+        for board in (["Kd", "9d", "4d", "2s"], ["7h", "7c", "2s", "Jd", "Qh"], ["As", "5h", "3c"]):
+            board_cards = self.engine.parse_cards(board)
+            board_ids = [card.index for card in board_cards]
+            remaining = self.engine.get_remaining_deck(board_cards)
+            expected = min(
+                evaluate_cards(*board_ids, first.index, second.index)
+                for first, second in combinations(remaining, 2)
+            )
+            
+            assert self.engine._find_best_possible_hand_strength(board_cards) == expected
+    
     def test_find_best_possible_hand_strength(self):
         """Test finding the best possible hand strength for a given board."""
         # Board with royal flush potential
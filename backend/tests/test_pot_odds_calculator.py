@@ -2,7 +2,9 @@
 
 import pytest
 from poker_engine import PokerEngine
-from pot_odds_calculator import PotOddsCalculator, OptimizedPotOddsCalculator
+from pot_odds_calculator import (
+    PotOddsCalculator, OptimizedPotOddsCalculator, FLOP_POT_ODDS_RATIOS, TURN_POT_ODDS_RATIOS,
+)
 
 
 class TestPotOddsCalculator:
@@ -14,70 +16,53 @@ class TestPotOddsCalculator:
         self.calculator = PotOddsCalculator(self.engine)
         self.opt_calculator = OptimizedPotOddsCalculator(self.engine)
     
+    @pytest.fixture(params=[PotOddsCalculator, OptimizedPotOddsCalculator], ids=["standard", "optimized"])
+    def any_calculator(self, request):
+        """Each calculator implementation, so shared behaviour is tested on both."""
+        return request.param(self.engine)
+    
     def test_calculator_initialization(self):
         """Test calculator initialization."""
         assert self.calculator.engine == self.engine
         assert self.calculator.outs_detector is not None
     
-    def test_calculate_flop_probability_4_outs(self):
-        """Test flop probability calculation with 4 outs."""
-        # Formula: 1 - [(47-4)/47] × [(46-4)/46] = 1 - (43/47 × 42/46) = 16.47%
-        probability = self.calculator._calculate_flop_probability(4)
-        expected = 1 - (43/47 * 42/46)
-        
-        assert abs(probability - expected) < 0.0001
-        assert abs(probability - 0.1647) < 0.01  # Approximately 16.47%
-    
-    def test_calculate_flop_probability_9_outs(self):
-        """Test flop probability calculation with 9 outs (flush draw)."""
-        # Formula: 1 - [(47-9)/47] × [(46-9)/46] = 1 - (38/47 × 37/46) = 34.97%
-        probability = self.calculator._calculate_flop_probability(9)
-        expected = 1 - (38/47 * 37/46)
-        
-        assert abs(probability - expected) < 0.0001
-        assert abs(probability - 0.3497) < 0.01  # Approximately 34.97%
+    def test_calculators_use_slots(self):
+        """Test calculators keep their attributes in slots, without a per-instance dict."""
+        assert not hasattr(self.calculator, '__dict__')
+        assert not hasattr(OptimizedPotOddsCalculator(self.engine), '__dict__')
     
-    def test_calculate_turn_probability_4_outs(self):
-        """Test turn probability calculation with 4 outs."""
-        # Formula: 4/46 = 8.70%
-        probability = self.calculator._calculate_turn_probability(4)
-        expected = 4/46
-        
-        assert abs(probability - expected) < 0.0001
-        assert abs(probability - 0.087) < 0.01  # Approximately 8.70%
+    @pytest.mark.parametrize("outs, expected, approximate", [
+        # 1 - [(47-4)/47] × [(46-4)/46] = 1 - (43/47 × 42/46) = 16.47%
+        (4, 1 - (43/47 * 42/46), 0.1647),
+        # 1 - [(47-9)/47] × [(46-9)/46] = 1 - (38/47 × 37/46) = 34.97% (flush draw)
+        (9, 1 - (38/47 * 37/46), 0.3497),
+    ])
+    def test_calculate_flop_probability(self, outs, expected, approximate):
+        """Test flop probability calculation against the two-cards-to-come formula."""
+        probability = self.calculator._calculate_flop_probability(outs)
+        
+        assert probability == pytest.approx(expected)
+        assert probability == pytest.approx(approximate, abs=0.01)
     
-    def test_calculate_turn_probability_9_outs(self):
-        """Test turn probability calculation with 9 outs."""
-        # Formula: 9/46 = 19.57%
-        probability = self.calculator._calculate_turn_probability(9)
-        expected = 9/46
-        
-        assert abs(probability - expected) < 0.0001
-        assert abs(probability - 0.1957) < 0.01  # Approximately 19.57%
+    @pytest.mark.parametrize("outs, expected, approximate", [
+        (4, 4/46, 0.087),    # 4/46 = 8.70%
+        (9, 9/46, 0.1957),   # 9/46 = 19.57%
+    ])
+    def test_calculate_turn_probability(self, outs, expected, approximate):
+        """Test turn probability calculation against the one-card-to-come formula."""
+        probability = self.calculator._calculate_turn_probability(outs)
+        
+        assert probability == pytest.approx(expected)
+        assert probability == pytest.approx(approximate, abs=0.01)
     
-    def test_format_pot_odds_ratio_4_outs_flop(self):
-        """Test pot odds ratio formatting for 4 outs on flop."""
-        # 16.47% win rate → 83.53% lose rate → 83.53/16.47 = 5.07 ≈ 5.1:1
-        probability = 0.1647
-        ratio = self.calculator._format_pot_odds_ratio(probability)
-        
-        assert ratio == "5.1:1"
-    
-    def test_format_pot_odds_ratio_9_outs_flop(self):
-        """Test pot odds ratio formatting for 9 outs on flop."""
-        # 34.97% win rate → 65.03% lose rate → 65.03/34.97 = 1.86 ≈ 1.9:1
-        probability = 0.3497
-        ratio = self.calculator._format_pot_odds_ratio(probability)
-        
-        assert ratio == "1.9:1"
-    
-    def test_format_pot_odds_ratio_integer(self):
-        """Test pot odds ratio formatting for integer ratios."""
-        # 20% win rate → 80% lose rate → 80/20 = 4.0 → 4:1 (no decimal)
-        probability = 0.20
-        ratio = self.calculator._format_pot_odds_ratio(probability)
-        
-        assert ratio == "4:1"
+    @pytest.mark.parametrize("probability, expected", [
+        (0.1647, "5.1:1"),   # 4 outs on flop: 83.53/16.47 = 5.07 ≈ 5.1:1
+        (0.3497, "1.9:1"),   # 9 outs on flop: 65.03/34.97 = 1.86 ≈ 1.9:1
+        (0.20, "4:1"),       # 80/20 = 4.0 → 4:1 (no decimal)
+    ])
+    def test_format_pot_odds_ratio(self, probability, expected):
+        """Test pot odds ratio formatting, dropping a trailing .0."""
+        assert self.calculator._format_pot_odds_ratio(probability) == expected
     
     def test_format_pot_odds_ratio_edge_cases(self):
         """Test pot odds ratio formatting for edge cases."""
@@ -93,13 +78,13 @@ class TestPotOddsCalculator:
         ratio = self.calculator._format_pot_odds_ratio(0.001)
         assert ratio.endswith(":1")
     
-    def test_calculate_pot_odds_inside_straight_draw(self):
+    def test_calculate_pot_odds_inside_straight_draw(self, any_calculator):
         """Test pot odds calculation for inside straight draw."""
         # Hand: 9s 8h, Board: 5c 6d Ks (4 outs for straight)
         hole_cards = self.engine.parse_cards(["9s", "8h"])
         community_cards = self.engine.parse_cards(["5c", "6d", "Ks"])
         
-        pot_odds_ratio, outs = self.calculator.calculate_pot_odds(hole_cards, community_cards)
+        pot_odds_ratio, outs = any_calculator.calculate_pot_odds(hole_cards, community_cards)
         
         # With a weak hand (9-high), many cards improve it, so odds will be low
         assert len(outs) >= 4  # Should find at least the 4 sevens for straight
@@ -108,13 +93,13 @@ class TestPotOddsCalculator:
         straight_outs = [out for out in outs if 'straight' in out['draw_type']]
         assert len(straight_outs) >= 4  # Should find 4 sevens
     
-    def test_calculate_pot_odds_flush_draw(self):
+    def test_calculate_pot_odds_flush_draw(self, any_calculator):
         """Test pot odds calculation for flush draw."""
         # Hand: As Ks, Board: 7s 3s Jd (9 outs for flush)
         hole_cards = self.engine.parse_cards(["As", "Ks"])
         community_cards = self.engine.parse_cards(["7s", "3s", "Jd"])
         
-        pot_odds_ratio, outs = self.calculator.calculate_pot_odds(hole_cards, community_cards)
+        pot_odds_ratio, outs = any_calculator.calculate_pot_odds(hole_cards, community_cards)
         
         # With strong cards (A,K) and 4-card flush draw, many cards improve the hand
         assert len(outs) >= 9  # Should find at least the 9 spades
@@ -123,13 +108,13 @@ class TestPotOddsCalculator:
         flush_outs = [out for out in outs if out['draw_type'] == 'flush']
         assert len(flush_outs) >= 9  # Should find 9 spades for flush
     
-    def test_calculate_pot_odds_no_outs(self):
+    def test_calculate_pot_odds_no_outs(self, any_calculator):
         """Test pot odds calculation with no outs."""
         # Royal flush - no improving cards, but this is NUTS!
         hole_cards = self.engine.parse_cards(["As", "Ks"])
         community_cards = self.engine.parse_cards(["Qs", "Js", "Ts"])
         
-        pot_odds_ratio, outs = self.calculator.calculate_pot_odds(hole_cards, community_cards)
+        pot_odds_ratio, outs = any_calculator.calculate_pot_odds(hole_cards, community_cards)
         
         # According to API spec: completed royal flush using both hole cards should be NUTS!
         assert pot_odds_ratio == "NUTS!"
@@ -160,6 +145,19 @@ class TestPotOddsCalculator:
         assert breakdown['game_phase'] == 'turn'
         assert 'turn_probability' in breakdown
     
+    def test_get_probability_breakdown_reuses_outs(self):
+        """Test the breakdown reuses the outs search from calculate_pot_odds."""
+        hole_cards = self.engine.parse_cards(["As", "Ks"])
+        community_cards = self.engine.parse_cards(["7s", "3s", "Jd"])
+        
+        _, outs = self.calculator.calculate_pot_odds(hole_cards, community_cards)
+        misses = self.calculator.outs_detector._find_outs_cached.cache_info().misses
+        breakdown = self.calculator.get_probability_breakdown(hole_cards, community_cards)
+        
+        assert self.calculator.outs_detector._find_outs_cached.cache_info().misses == misses
+        assert breakdown['num_outs'] == len(outs)
+        assert sum(len(cards) for cards in breakdown['outs_by_type'].values()) == len(outs)
+    
     def test_calculate_exact_odds_from_examples(self):
         """Test exact odds calculation for specification examples."""
         examples = self.calculator.calculate_exact_odds_from_examples()
@@ -178,7 +176,15 @@ class TestPotOddsCalculator:
             exp_num = float(expected.split(':')[0])
             
             # Should be within 0.2 of expected
-            assert abs(calc_num - exp_num) < 0.2
+            assert calc_num == pytest.approx(exp_num, abs=0.2)
+    
+    def test_exact_odds_examples_are_shared_and_read_only(self):
+        """Test the examples are computed once and can't be modified by callers."""
+        examples = self.calculator.calculate_exact_odds_from_examples()
+        
+        assert examples is PotOddsCalculator(self.engine).calculate_exact_odds_from_examples()
+        with pytest.raises(TypeError):
+            examples['4_outs_flop']['ratio'] = '0:1'
     
     def test_optimized_calculator_same_results(self):
         """Test that optimized calculator gives same results as standard."""
@@ -188,9 +194,66 @@ class TestPotOddsCalculator:
         standard_result = self.calculator.calculate_pot_odds(hole_cards, community_cards)
         optimized_result = self.opt_calculator.calculate_pot_odds(hole_cards, community_cards)
         
-        # Results should be identical
-        assert standard_result[0] == optimized_result[0]  # Same pot odds ratio
-        assert len(standard_result[1]) == len(optimized_result[1])  # Same number of outs
+        # Results should be identical, outs included
+        assert standard_result == optimized_result
+    
+    def test_calculate_pot_odds_mask_matches_card_lists(self):
+        """Test that the bitmask entry point matches the Card list entry point."""
+        hole_cards = self.engine.parse_cards(["As", "Ks"])
+        community_cards = self.engine.parse_cards(["7s", "3s", "Jd"])
+        
+        mask_result = self.calculator.calculate_pot_odds_mask(
+            self.engine.cards_to_mask(hole_cards),
+            self.engine.cards_to_mask(community_cards)
+        )
+        
+        assert mask_result == self.calculator.calculate_pot_odds_entries(hole_cards, community_cards)
+    
+    def test_calculate_pot_odds_entries_matches_dicts(self):
+        """Test that the OutEntry entry point matches calculate_pot_odds and is cached."""
+        hole_cards = self.engine.parse_cards(["9s", "8s"])
+        community_cards = self.engine.parse_cards(["7h", "6s", "2s"])
+        
+        ratio, entries = self.calculator.calculate_pot_odds_entries(hole_cards, community_cards)
+        
+        assert isinstance(entries, tuple)
+        assert entries[0].card and entries[0].draw_type
+        assert (ratio, [entry._asdict() for entry in entries]) == \
+            self.calculator.calculate_pot_odds(hole_cards, community_cards)
+        assert self.calculator.calculate_pot_odds_entries(hole_cards, community_cards)[1] is entries
+    
+    def test_calculate_pot_odds_mask_rejects_overlap(self):
+        """Test that overlapping hole and community masks are rejected."""
+        hole_mask = self.engine.cards_to_mask(self.engine.parse_cards(["As", "Ks"]))
+        community_mask = self.engine.cards_to_mask(self.engine.parse_cards(["As", "3s", "Jd"]))
+        
+        with pytest.raises(ValueError, match="Duplicate cards"):
+            self.calculator.calculate_pot_odds_mask(hole_mask, community_mask)
+    
+    def test_nuts_check_errors_propagate(self, monkeypatch):
+        """Test unexpected engine errors surface instead of reading as 'not nuts'."""
+        def broken_evaluate(hole_cards, community_cards):
+            raise RuntimeError("evaluator failure")
+        
+        monkeypatch.setattr(self.engine, "evaluate_hand_strength", broken_evaluate)
+        hole_cards = self.engine.parse_cards(["As", "Ks"])
+        community_cards = self.engine.parse_cards(["Qs", "Js", "Ts", "2h", "3d"])
+        
+        with pytest.raises(RuntimeError, match="evaluator failure"):
+            self.calculator._check_for_river_nuts(hole_cards, community_cards)
+        with pytest.raises(RuntimeError, match="evaluator failure"):
+            self.calculator._check_for_completed_nuts(hole_cards, community_cards[:3])
+    
+    def test_river_nuts_memoized_by_card_set(self):
+        """Test the river nuts check is cached regardless of card order."""
+        hole_cards = self.engine.parse_cards(["As", "Ks"])
+        community_cards = self.engine.parse_cards(["Qs", "Js", "Ts", "2h", "3d"])
+        
+        assert self.calculator._check_for_river_nuts(hole_cards, community_cards)
+        misses = self.calculator._river_nuts_cached.cache_info().misses
+        
+        assert self.calculator._check_for_river_nuts(hole_cards[::-1], community_cards[::-1])
+        assert self.calculator._river_nuts_cached.cache_info().misses == misses
     
     def test_probability_calculation_boundary_values(self):
         """Test probability calculations with boundary values."""
@@ -206,6 +269,25 @@ class TestPotOddsCalculator:
         prob = self.calculator._calculate_turn_probability(46)
         assert prob == 1.0
     
+    def test_probability_tables_match_formulas(self):
+        """Test the precomputed probabilities for every possible number of outs."""
+        for num_outs in range(1, 47):
+            expected = 1 - ((47 - num_outs) / 47) * ((46 - num_outs) / 46)
+            assert self.calculator._calculate_flop_probability(num_outs) == expected
+        for num_outs in range(1, 46):
+            assert self.calculator._calculate_turn_probability(num_outs) == num_outs / 46
+        assert self.calculator._calculate_flop_probability(-1) == 0.0
+        assert self.calculator._calculate_turn_probability(100) == 1.0
+    
+    def test_pot_odds_ratio_tables_match_formatting(self):
+        """Test the precomputed ratio strings match formatting each probability."""
+        for num_outs, ratio in enumerate(FLOP_POT_ODDS_RATIOS):
+            probability = self.calculator._calculate_flop_probability(num_outs)
+            assert ratio == self.calculator._format_pot_odds_ratio(probability)
+        for num_outs, ratio in enumerate(TURN_POT_ODDS_RATIOS):
+            probability = self.calculator._calculate_turn_probability(num_outs)
+            assert ratio == self.calculator._format_pot_odds_ratio(probability)
+    
     
     def test_calculate_pot_odds_with_nuts_returns_special_value(self):
         """Test that calculate_pot_odds returns 'NUTS!' when nuts are detected."""